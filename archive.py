@@ -0,0 +1,61 @@
+import os
+import re
+
+import pandas as pd
+
+from job_model import to_model, to_storage
+from storage import STORED_COLUMNS, ExcelJobStore, SaveBatch
+
+# Done jobs whose Production Date is older than this many days are archived by default
+ARCHIVE_AFTER_DAYS = 180
+
+PARTITION_PATTERN = re.compile(r"^(\d{4}-\d{2})\.xlsx$")
+
+
+def archive_directory(store_path):
+    # jobs.xlsx (or jobs.db) -> jobs_archive/
+    return f"{os.path.splitext(store_path)[0]}_archive"
+
+
+def archivable(df, older_than_days, today=None):
+    # Mask of Done jobs produced more than `older_than_days` days ago
+    today = pd.Timestamp.now().normalize() if today is None else today
+    cutoff = today - pd.Timedelta(days=older_than_days)
+    return ((df["Status"] == "Done") & (df["Production Date"] < cutoff)).to_numpy()
+
+
+class JobArchive:
+    # Archived jobs, one workbook per month of Production Date (e.g. jobs_archive/2024-03.xlsx). Each partition
+    # is an ExcelJobStore, so it gets the same atomic writes and fast-loading cache as the working workbook,
+    # and nothing is read until the archive is asked for.
+    def __init__(self, store_path):
+        self.directory = archive_directory(store_path)
+
+    def partition_store(self, month):
+        return ExcelJobStore(os.path.join(self.directory, f"{month}.xlsx"))
+
+    def months(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(match.group(1) for match in map(PARTITION_PATTERN.match, os.listdir(self.directory)) if match)
+
+    def load(self, months=None):
+        # Typed jobs from the given months (all by default), with a fresh 0..n-1 index; None if there are none.
+        # Partitions are combined as stored text and typed once, so every column gets one set of categories.
+        frames = [self.partition_store(month).load() for month in (self.months() if months is None else months)]
+        if not frames:
+            return None
+        return to_model(pd.concat(frames, ignore_index=True))
+
+    def add(self, jobs):
+        # Merge typed jobs into their month's partition. Rows already there are skipped, so re-running an
+        # archive that was interrupted before the jobs left the working store doesn't duplicate them.
+        os.makedirs(self.directory, exist_ok=True)
+        months = jobs["Production Date"].dt.strftime("%Y-%m")
+        for month, group in jobs.groupby(months.to_numpy()):
+            store = self.partition_store(month)
+            if os.path.exists(store.path):
+                group = to_model(pd.concat([store.load(), to_storage(group)], ignore_index=True))
+            batch = SaveBatch()
+            batch.replace_all(group.drop_duplicates(subset=STORED_COLUMNS, ignore_index=True))
+            store.write(batch)
@@ -0,0 +1,312 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tkinter as tk
+
+from excelDummyScript import generate_jobs, write_jobs
+from job_model import COLUMNS
+from main import JobManagementApp
+from pdf_report import build_undone_report, undone_jobs
+from performance import PerformanceMonitor
+from search_index import JobSearchIndex
+from sort_orders import SortOrders
+from save_worker import SaveWorker
+
+
+class HeadlessWidget:
+    # Stand-in for labels and buttons when there is no display
+    def __init__(self):
+        self.options = {}
+
+    def config(self, **options):
+        self.options.update(options)
+
+    configure = config
+
+    def pack(self, **options):
+        pass
+
+    def pack_forget(self):
+        pass
+
+    def set(self, first, last):
+        pass
+
+
+class HeadlessVar:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class HeadlessRoot:
+    def after(self, delay, callback=None, *args):
+        return "after#headless"
+
+    def after_cancel(self, after_id):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+
+class HeadlessTreeview:
+    # Just enough of ttk.Treeview for the app's refresh code; counts calls so runs can compare Tk traffic
+    def __init__(self):
+        self.children = []
+        self.items = {}
+        self.selected = ()
+        self.calls = 0
+
+    def get_children(self, item=""):
+        return tuple(self.children)
+
+    def insert(self, parent, index, iid=None, values=(), tags=()):
+        self.calls += 1
+        self.children.insert(len(self.children) if index == tk.END else index, iid)
+        self.items[iid] = (tuple(values), tuple(tags))
+        return iid
+
+    def delete(self, *items):
+        self.calls += 1
+        removed = set(items)
+        self.children = [item for item in self.children if item not in removed]
+        for item in items:
+            del self.items[item]
+
+    def detach(self, *items):
+        self.calls += 1
+        removed = set(items)
+        self.children = [item for item in self.children if item not in removed]
+
+    def move(self, item, parent, index):
+        self.calls += 1
+        if item in self.children:
+            self.children.remove(item)
+        self.children.insert(index, item)
+
+    def set_children(self, item, *children):
+        self.calls += 1
+        self.children = list(children)
+
+    def index(self, item):
+        self.calls += 1
+        return self.children.index(item)
+
+    def item(self, item, option=None, **options):
+        self.calls += 1
+        if options:
+            values, tags = self.items[item]
+            self.items[item] = (tuple(options.get("values", values)), tuple(options.get("tags", tags)))
+            return None
+        return self.items[item][0] if option == "values" else self.items[item]
+
+    def selection(self):
+        return tuple(item for item in self.selected if item in self.items)
+
+    def selection_set(self, items):
+        self.calls += 1
+        self.selected = tuple(items)
+
+    def tag_configure(self, tag, **options):
+        self.calls += 1
+
+    def heading(self, column, **options):
+        self.calls += 1
+
+    def yview_moveto(self, fraction):
+        self.calls += 1
+
+    def winfo_height(self):
+        return 1
+
+    def cget(self, option):
+        return 10
+
+
+def headless_app(file_path):
+    # A JobManagementApp whose widgets are stand-ins, for machines without a display
+    app = JobManagementApp.__new__(JobManagementApp)
+    app.root = HeadlessRoot()
+    app.file_path = file_path
+    app.store = None
+    app.perf = PerformanceMonitor()
+    app.columns = tuple(COLUMNS)
+    app.virtual_list = HeadlessVar(False)
+    app.include_archive = HeadlessVar(False)
+    app.job_tree = HeadlessTreeview()
+    app.job_scrollbar = HeadlessWidget()
+    app.tree_rows = {}
+    app.tree_order = []
+    app.row_items = {}
+    app.tree_labels = None
+    app.dirty_rows = set()
+    app.populate_id = None
+    app.view_offset = 0
+    app.window_start = 0
+    app.selection_ids = ()
+    app.restored_selection = None
+    app.row_height = 20
+    app.sort_orders = SortOrders()
+    app.sort_column = None
+    app.sort_descending = False
+    app.search_text = HeadlessVar("")
+    app.search_index = JobSearchIndex()
+    app.search_matches = None
+    app.search_after_id = None
+    app.search_poll_id = None
+    for name in ("status_bar", "save_status", "cancel_report_button", "edit_button", "save_button", "mark_done_button", "mark_not_done_button", "delete_button", "bulk_edit_button"):
+        setattr(app, name, HeadlessWidget())
+    app.report_job = None
+    app.load_jobs_from_excel(file_path)
+    app.save_worker = SaveWorker(app.store, delay=0)
+    return app
+
+
+def open_app(file_path, headless):
+    if not headless:
+        try:
+            root = tk.Tk()
+        except tk.TclError:
+            headless = True
+        else:
+            root.withdraw()
+            return JobManagementApp(root, file_path), root
+    return headless_app(file_path), None
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def wait_for_file(path, timeout=60):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def wait_for_search_index(app, timeout=600):
+    # Let the background index build finish so it doesn't compete with the next timing
+    deadline = time.monotonic() + timeout
+    while app.search_index.install_build() is None and not app.search_index.ready and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def run_size(rows, data_dir, headless, pdf_max_rows, seed):
+    results = {"rows": rows}
+
+    # Generated workbooks are reused between runs; writing a large xlsx takes far longer than the benchmarks
+    file_path = os.path.join(data_dir, f"jobs_{rows}.xlsx")
+    if not os.path.exists(file_path):
+        results["generate_seconds"] = timed(lambda: write_jobs(generate_jobs(rows, seed=seed), file_path))
+    app, root = open_app(file_path, headless)
+    cache_path = app.store.cache_path
+    results["headless"] = root is None
+
+    # Opening the app already loaded once; drop the cache sidecar it built so the first timed load reads the workbook.
+    # Loading includes filling the job list; the second load hits the sidecar rebuilt by the first.
+    wait_for_file(cache_path)
+    os.remove(cache_path)
+    wait_for_search_index(app)
+    results["load_jobs_cold_seconds"] = timed(app.load_jobs_from_excel, file_path)
+    wait_for_file(cache_path)
+    wait_for_search_index(app)
+    results["load_jobs_cached_seconds"] = timed(app.load_jobs_from_excel, file_path)
+    wait_for_search_index(app)
+
+    results["treeview_full_seconds"] = timed(app.update_treeview, full=True)
+    results["treeview_noop_refresh_seconds"] = timed(app.update_treeview)
+
+    # The search index normally builds in the background after a load; here it is built in the foreground to time it
+    results["search_index_build_seconds"] = timed(app.search_index.build, app.df, background=False)
+    for query in ("s", "smith", "maple av"):
+        app.search_text.set(query)
+        results[f"search_{query.replace(' ', '_')}_seconds"] = timed(app.apply_search)
+    app.search_text.set("")
+    app.apply_search()
+
+    # Sorting by a column the first time, reversing it from the cache, and going back to the default order
+    results["sort_name_seconds"] = timed(app.sort_by, "Name")
+    results["sort_name_descending_seconds"] = timed(app.sort_by, "Name")
+    results["sort_default_seconds"] = timed(app.sort_by, "Name")
+
+    # Mark the first open job done, as a user would from the top of the list
+    open_items = [item_id for item_id in app.tree_order if app.df.at[app.row_for_item(item_id), "Status"] == "Not Done"]
+    if open_items:
+        app.job_tree.selection_set((open_items[0],))
+        calls_before = getattr(app.job_tree, "calls", None)
+        app.perf.enabled = True
+        results["mark_done_seconds"] = timed(app.mark_done)
+        app.perf.enabled = False
+        results["mark_done_phases"] = app.perf.latest()["phases"]
+        if calls_before is not None:
+            results["mark_done_tk_calls"] = app.job_tree.calls - calls_before
+    results["mark_done_flush_seconds"] = timed(app.save_worker.flush)
+
+    results["save_to_excel_ui_seconds"] = timed(app.save_to_excel)
+    results["save_to_excel_flush_seconds"] = timed(app.save_worker.flush)
+
+    jobs = undone_jobs(app.df).head(pdf_max_rows)
+    results["print_pdf_rows"] = len(jobs)
+    results["print_pdf_seconds"] = timed(build_undone_report, jobs, os.path.join(data_dir, f"report_{rows}.pdf"))
+
+    app.save_worker.stop()
+    if root is not None:
+        root.destroy()
+    return results
+
+
+def import_seconds(module):
+    # In a fresh interpreter: what importing the module costs before the app can put its window up
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True)
+    return float(result.stdout)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the app's hot paths on generated workbooks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="row counts to benchmark (e.g. 1000 10000 100000 1000000)")
+    parser.add_argument("--data-dir", default="bench_data", help="where generated workbooks and reports are kept")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file for the results")
+    parser.add_argument("--headless", action="store_true", help="use stand-in widgets even if a display is available")
+    parser.add_argument("--pdf-max-rows", type=int, default=20000, help="cap on undone jobs put in the benchmark PDF")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for generated data")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "import_main_seconds": import_seconds("main"),
+        "results": [],
+    }
+    for rows in args.sizes:
+        print(f"Benchmarking {rows} rows...")
+        result = run_size(rows, args.data_dir, args.headless, args.pdf_max_rows, args.seed)
+        report["results"].append(result)
+        for name, value in result.items():
+            print(f"  {name}: {value:.4f}" if isinstance(value, float) else f"  {name}: {value}")
+
+    with open(args.output, "w") as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"Wrote {args.output}")
@@ -0,0 +1,120 @@
+import bisect
+import heapq
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from job_columns import AGING_BUCKETS, AGING_STEP_DAYS
+from job_model import aging_buckets, text_values
+
+# Rows shown in the dashboard's oldest-jobs and location lists, and weeks of completed jobs
+DASHBOARD_TOP = 10
+DASHBOARD_WEEKS = 8
+
+
+def week_starts(dates):
+    # "YYYY-MM-DD" of the Monday starting each date's week; "" for a missing date
+    dates = dates.dt.normalize()
+    mondays = dates - pd.to_timedelta(dates.dt.weekday, unit="D")
+    return mondays.dt.strftime("%Y-%m-%d").astype(object).where(dates.notna(), "")
+
+
+def bucket_name(bucket):
+    start = bucket * AGING_STEP_DAYS
+    return f"{start}+ days" if bucket == AGING_BUCKETS - 1 else f"{start}-{start + AGING_STEP_DAYS - 1} days"
+
+
+class ShopDashboard:
+    # Shop totals over the working jobs: open jobs per aging bucket, the oldest open jobs, open value per
+    # Location and Done jobs per week of Completed Date (jobs finished before it was kept have none and aren't
+    # counted). Built from the table the first time it's shown, then kept current from the rows each change touches: a row's old
+    # contribution is taken out and its new one added, so a click costs a few dict updates, not a groupby.
+    def __init__(self):
+        self.rows = None  # Row label -> (open, bucket, days, location, price, week) as counted; None until built
+        self.version = 0  # Bumped on every change, so an open window only redraws when something moved
+
+    def build(self, df):
+        is_open, buckets, days, locations, prices, weeks = columns = self.columns(df)
+        labels = df.index.to_numpy()
+        self.rows = dict(zip(labels.tolist(), zip(*(column.tolist() for column in columns))))
+
+        # The starting totals come from vectorized counts over the whole table
+        self.open_counts = np.bincount(buckets[is_open], minlength=AGING_BUCKETS).tolist()
+        self.open_value = int(prices[is_open].sum())
+        open_locations = pd.Series(prices[is_open]).groupby(locations[is_open])
+        self.location_jobs = Counter(open_locations.size().to_dict())
+        self.location_values = Counter({location: int(value) for location, value in open_locations.sum().items()})
+        done_weeks = weeks[~is_open]
+        self.completed = Counter(done_weeks[done_weeks != ""].tolist())  # Week -> Done jobs
+        positions = np.lexsort((labels[is_open], -days[is_open]))
+        self.oldest = list(zip((-days[is_open][positions]).tolist(), labels[is_open][positions].tolist()))  # (-days, label), oldest first
+        self.version += 1
+
+    def columns(self, df):
+        # What each row counts towards, one numpy array per field of a `rows` entry
+        return (
+            (df["Status"] != "Done").to_numpy(),
+            aging_buckets(df["Days in Shop"]).to_numpy(dtype="int64"),
+            df["Days in Shop"].to_numpy(dtype="int64"),
+            text_values(df["Location"]).to_numpy(dtype=object),
+            df["Price"].to_numpy(dtype="int64", na_value=0),
+            week_starts(df["Completed Date"]).to_numpy(dtype=object),
+        )
+
+    def count(self, row_label, entry, sign):
+        is_open, bucket, days, location, price, week = entry
+        if is_open:
+            self.open_counts[bucket] += sign
+            self.open_value += sign * price
+            self.location_jobs[location] += sign
+            self.location_values[location] += sign * price
+            if not self.location_jobs[location]:
+                del self.location_jobs[location], self.location_values[location]
+            key = (-days, row_label)
+            if sign > 0:
+                bisect.insort(self.oldest, key)
+            else:
+                del self.oldest[bisect.bisect_left(self.oldest, key)]
+        elif week:
+            self.completed[week] += sign
+            if not self.completed[week]:
+                del self.completed[week]
+
+    def remove_rows(self, row_labels):
+        if self.rows is None:
+            return
+        for row_label in row_labels:
+            entry = self.rows.pop(row_label, None)
+            if entry is not None:
+                self.count(row_label, entry, -1)
+        self.version += 1
+
+    def update_rows(self, df, row_labels, excluded=()):
+        # Re-count added or changed rows; `excluded` ones (archived rows left in view) are only taken out
+        if self.rows is None:
+            return
+        self.remove_rows(row_labels)
+        changed = df.loc[list(row_labels)]
+        changed = changed[~changed.index.isin(excluded)]
+        for row_label, entry in zip(changed.index.tolist(), zip(*(column.tolist() for column in self.columns(changed)))):
+            self.rows[row_label] = entry
+            self.count(row_label, entry, 1)
+
+    def open_by_bucket(self):
+        return [(bucket_name(bucket), count) for bucket, count in enumerate(self.open_counts)]
+
+    def oldest_open(self, count=DASHBOARD_TOP):
+        # (row label, Days in Shop) of the open jobs longest in the shop
+        return [(row_label, -negative_days) for negative_days, row_label in self.oldest[:count]]
+
+    def top_locations(self, count=DASHBOARD_TOP):
+        # (Location, open jobs, open value in cents), largest value first
+        return [(location, self.location_jobs[location], value) for location, value in heapq.nlargest(count, self.location_values.items(), key=lambda item: item[1])]
+
+    def completed_weeks(self, count=DASHBOARD_WEEKS, today=None):
+        # (week, Done jobs) for the last `count` weeks, this one first
+        today = pd.Timestamp.now().normalize() if today is None else today
+        monday = today - pd.Timedelta(days=today.weekday())
+        weeks = [(monday - pd.Timedelta(weeks=weeks_back)).strftime("%Y-%m-%d") for weeks_back in range(count)]
+        return [(week, self.completed.get(week, 0)) for week in weeks]
@@ -1,63 +1,98 @@
+import argparse
+
+import numpy as np
 import pandas as pd
-from random import randint
-from datetime import datetime, timedelta
-
-# Generate random dates within the specified range
-def generate_random_date(start_date, end_date):
-    delta = end_date - start_date
-    random_days = randint(0, delta.days)
-    return start_date + timedelta(days=random_days)
-
-start_date = datetime.strptime("2024-01-15", "%Y-%m-%d")
-end_date = datetime.strptime("2024-07-20", "%Y-%m-%d")
-
-# Create a DataFrame with the dummy job data
-data = {
-    "Sign Off Date": [generate_random_date(start_date, end_date).strftime("%Y-%m-%d") for _ in range(15)],
-    "Name": [
-        "Alice Smith", "Bob Johnson", "Carol White", "David Brown", "Eve Black",
-        "Frank Green", "Grace Blue", "Hank Pink", "Ivy Red", "Jack Gold",
-        "Kelly Silver", "Leo Copper", "Mona Bronze", "Nina Violet", "Oscar Crimson"
-    ],
-    "Phone Number": [
-        "555-5678", "555-8765", "555-4321", "555-1234", "555-6789",
-        "555-2468", "555-1357", "555-9876", "555-6543", "555-3210",
-        "555-2468", "555-7531", "555-3698", "555-1597", "555-7530"
-    ],
-    "Location": [
-        "456 Maple Avenue, Springfield", "789 Oak Street, Springfield", "321 Pine Lane, Springfield", "654 Birch Boulevard, Springfield", "987 Cedar Circle, Springfield",
-        "123 Aspen Drive, Springfield", "246 Elm Court, Springfield", "369 Willow Way, Springfield", "753 Cherry Road, Springfield", "951 Spruce Street, Springfield",
-        "357 Poplar Place, Springfield", "159 Fir Terrace, Springfield", "753 Redwood Row, Springfield", "159 Cypress Crescent, Springfield", "753 Alder Alley, Springfield"
-    ],
-    "Production Date": [generate_random_date(start_date, end_date).strftime("%Y-%m-%d") for _ in range(15)],
-    "Price": [
-        "$200.00", "$350.00", "$175.00", "$400.00", "$225.00",
-        "$300.00", "$250.00", "$375.00", "$500.00", "$275.00",
-        "$320.00", "$340.00", "$360.00", "$380.00", "$400.00"
-    ],
-    "Notes": [
-        "Urgent job completed ahead of schedule. No issues reported.",
-        "Job had some delays due to supply chain issues. Extra charges applied.",
-        "Completed on time. Minor adjustments requested post-delivery.",
-        "Quality assurance passed with no issues.",
-        "Customer requested an additional feature, causing a delay.",
-        "Job completed smoothly without any problems.",
-        "Some rework needed, but job finished on time.",
-        "Customer was very satisfied with the outcome.",
-        "Minor issues detected, quickly resolved.",
-        "Job was delayed due to inclement weather.",
-        "Client requested early delivery, accommodated successfully.",
-        "Job went as planned, no deviations.",
-        "Slight delay due to material shortage.",
-        "Finished ahead of schedule, no problems.",
-        "Customer provided positive feedback, no issues."
-    ],
-    "Job Number": [f"J{str(i).zfill(4)}" for i in range(1, 16)],
-    "Days in Shop": [str(randint(0, 90)) for _ in range(15)],
-    "Status": ["Not Done" if i % 2 == 0 else "Done" for i in range(15)]
-}
-
-df = pd.DataFrame(data)
-
-# Save the DataFrame to an Excel file
-df.to_excel("jobs.xlsx", index=False)
+
+from job_model import compute_days_in_shop, to_model
+from storage import SaveBatch, open_store, write_excel_atomic
+
+FIRST_NAMES = [
+    "Alice", "Bob", "Carol", "David", "Eve", "Frank", "Grace", "Hank", "Ivy", "Jack", "Kelly", "Leo", "Mona",
+    "Nina", "Oscar", "Paula", "Quinn", "Rosa", "Sam", "Tina", "Uma", "Victor", "Wendy", "Xavier", "Yara", "Zane",
+    "Maria", "Jose", "Wei", "Priya", "Ahmed", "Olga", "Kenji", "Fatima", "Liam", "Chloe", "Mateo", "Aisha",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "White", "Brown", "Black", "Green", "Blue", "Pink", "Red", "Gold", "Silver", "Copper",
+    "Bronze", "Violet", "Crimson", "Garcia", "Nguyen", "Patel", "Kim", "Martinez", "O'Brien", "Schmidt", "Rossi",
+    "Kowalski", "Haddad", "Tanaka", "Okafor", "Larsen", "Dubois", "Moreau", "Fischer", "Singh", "Cohen",
+]
+STREETS = [
+    "Maple", "Oak", "Pine", "Birch", "Cedar", "Aspen", "Elm", "Willow", "Cherry", "Spruce", "Poplar", "Fir",
+    "Redwood", "Cypress", "Alder", "Main", "Church", "Mill", "Lake", "Hill", "Park", "River", "Sunset", "Ridge",
+]
+STREET_TYPES = ["Street", "Avenue", "Lane", "Boulevard", "Circle", "Drive", "Court", "Way", "Road", "Place", "Terrace", "Row"]
+CITIES = ["Springfield", "Shelbyville", "Ogdenville", "North Haverbrook", "Capital City", "Brockway"]
+NOTE_SENTENCES = [
+    "Urgent job completed ahead of schedule.",
+    "No issues reported.",
+    "Job had some delays due to supply chain issues.",
+    "Extra charges applied.",
+    "Minor adjustments requested post-delivery.",
+    "Quality assurance passed with no issues.",
+    "Customer requested an additional feature, causing a delay.",
+    "Some rework needed, but job finished on time.",
+    "Customer was very satisfied with the outcome.",
+    "Waiting on parts from the supplier.",
+    "Call customer before pickup.",
+    "Client requested early delivery, accommodated successfully.",
+    "Slight delay due to material shortage.",
+    "Paint color changed after sign off; confirm with customer.",
+    "Second coat required on the left side panel.",
+]
+
+
+def generate_jobs(rows, seed=None, years=3):
+    # Random jobs in the workbook's column layout. Production dates span the last `years` years and older
+    # jobs are much more likely to be Done, like a real shop history.
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp.now().normalize()
+
+    def pick(values):
+        return pd.Series(np.asarray(values, dtype=object)[rng.integers(0, len(values), rows)])
+
+    age_days = rng.integers(0, 365 * years, rows)
+    production_dates = today - pd.to_timedelta(age_days, unit="D")
+    sign_off_dates = production_dates - pd.to_timedelta(rng.integers(0, 60, rows), unit="D")
+    done_probability = np.minimum(0.2 + age_days / 120, 0.98)
+    statuses = np.where(rng.random(rows) < done_probability, "Done", "Not Done")
+
+    sentence_counts = rng.choice([0, 1, 1, 2, 2, 3, 4, 6], rows)
+    sentence_picks = rng.integers(0, len(NOTE_SENTENCES), (rows, 6))
+    notes = [" ".join(NOTE_SENTENCES[i] for i in picks[:count]) for picks, count in zip(sentence_picks, sentence_counts)]
+
+    job_number_width = max(4, len(str(rows)))
+    df = pd.DataFrame({
+        "Sign Off Date": pd.Series(sign_off_dates).dt.strftime("%Y-%m-%d"),
+        "Name": pick(FIRST_NAMES) + " " + pick(LAST_NAMES),
+        "Phone Number": "555-" + pd.Series(rng.integers(0, 10000, rows)).astype(str).str.zfill(4),
+        "Location": pd.Series(rng.integers(1, 9999, rows)).astype(str) + " " + pick(STREETS) + " " + pick(STREET_TYPES) + ", " + pick(CITIES),
+        "Production Date": pd.Series(production_dates).dt.strftime("%Y-%m-%d"),
+        "Price": "$" + pd.Series(rng.integers(5, 500, rows) * 10).astype(str) + ".00",
+        "Notes": notes,
+        "Job Number": [f"J{str(i).zfill(job_number_width)}" for i in range(1, rows + 1)],
+        "Status": statuses,
+    })
+    df["Days in Shop"] = compute_days_in_shop(pd.Series(production_dates))
+    return df
+
+
+def write_jobs(df, path):
+    # Workbooks are written as-is; any other path goes through its job store (e.g. jobs.db for SQLite)
+    if path.lower().endswith(".xlsx"):
+        write_excel_atomic(df, path)
+        return
+    batch = SaveBatch()
+    batch.replace_all(to_model(df))
+    open_store(path).write(batch)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a dummy job workbook.")
+    parser.add_argument("rows", nargs="?", type=int, default=15, help="number of jobs (default 15)")
+    parser.add_argument("--output", default="jobs.xlsx", help="workbook (.xlsx) or SQLite database (.db) to write")
+    parser.add_argument("--seed", type=int, help="random seed for repeatable data")
+    args = parser.parse_args()
+
+    # Create a DataFrame with the dummy job data and save it
+    write_jobs(generate_jobs(args.rows, seed=args.seed), args.output)
+    print(f"Wrote {args.rows} jobs to {args.output}")
@@ -0,0 +1,31 @@
+# Column layout and aging colors of the job list. Kept free of pandas so the window can be built before the
+# data libraries are imported; job_model imports them from here.
+
+# Display order of the job columns
+COLUMNS = ["Sign Off Date", "Name", "Phone Number", "Location", "Production Date", "Price", "Notes", "Job Number", "Status", "Completed Date", "Days in Shop"]
+
+# Aging colors: one bucket per AGING_STEP_DAYS days in shop, the last one catching everything older
+AGING_STEP_DAYS = 10
+AGING_BUCKETS = 10
+
+
+def gradient_color(days):
+    # Green at 0 days, yellow at 45, red from 90 on
+    if days <= 45:
+        red = int((days / 45) * 255)
+        green = 255
+    elif days < 90:
+        red = 255
+        green = 255 - int(((days - 45) / 45) * 255)
+    else:
+        red = 255
+        green = 0
+    return f'#{red:02x}{green:02x}00'
+
+
+# Background color for each aging bucket, taken from the gradient at the bucket's middle
+AGING_COLORS = [gradient_color(min(bucket * AGING_STEP_DAYS + AGING_STEP_DAYS // 2, 90)) for bucket in range(AGING_BUCKETS)]
+
+
+def aging_bucket(days):
+    return min(max(int(days), 0) // AGING_STEP_DAYS, AGING_BUCKETS - 1)
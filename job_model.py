@@ -0,0 +1,272 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from job_columns import AGING_BUCKETS, AGING_COLORS, AGING_STEP_DAYS, COLUMNS
+
+STATUS_CATEGORIES = ["Not Done", "Done"]
+DATE_COLUMNS = ["Sign Off Date", "Production Date", "Completed Date"]
+REQUIRED_DATE_COLUMNS = ["Sign Off Date", "Production Date"]  # Entered with every job; Completed Date is stamped
+TEXT_COLUMNS = ["Name", "Phone Number", "Notes", "Job Number"]
+
+# Prices are kept as Int64 cents
+MAX_CENTS = float(np.iinfo("int64").max)
+
+
+def compute_days_in_shop(production_dates, today=None):
+    # Whole days from each production date to today, both taken at midnight
+    today = pd.Timestamp.now().normalize() if today is None else today
+    days = (today - pd.to_datetime(production_dates).dt.normalize()).dt.days
+    return days.fillna(0).clip(-32768, 32767).astype("int16")
+
+
+def days_since(production_date, today=None):
+    # One job's Days in Shop, by the same rule as the column
+    return int(compute_days_in_shop(pd.Series([production_date]), today).iloc[0])
+
+
+def aging_buckets(days):
+    # Vectorized: index into AGING_COLORS for every value of a Days in Shop column
+    return (days.clip(lower=0) // AGING_STEP_DAYS).clip(upper=AGING_BUCKETS - 1).astype("int8")
+
+
+def parse_prices(prices):
+    # "$1,200.50" / "1200.5" / 1200.5 -> 120050 cents; blanks become <NA>
+    text = prices.astype(object).where(prices.notna(), "").astype(str)
+    amounts = pd.to_numeric(text.str.replace(r"[$,\s]", "", regex=True).replace("", None), errors="coerce")
+    cents = (amounts * 100).round()
+    return cents.where(cents.abs() < MAX_CENTS).astype("Int64")  # inf or too large to store reads as missing
+
+
+def parse_price(text):
+    # Raises ValueError for anything that isn't a storable amount, "inf" and "1e400" included
+    text = str(text).strip()
+    if not text:
+        return pd.NA
+    cents = float(text.replace("$", "").replace(",", "")) * 100
+    if not math.isfinite(cents) or abs(cents) >= MAX_CENTS:
+        raise ValueError(f"Price out of range: {text}")
+    return int(round(cents))
+
+
+def format_price(cents):
+    if pd.isna(cents):
+        return ""
+    sign = "-" if cents < 0 else ""
+    dollars, remainder = divmod(abs(int(cents)), 100)
+    return f"{sign}${dollars}.{remainder:02d}"
+
+
+def format_prices(cents):
+    # Vectorized format_price
+    absolute = cents.abs()
+    text = "$" + (absolute // 100).astype(str) + "." + (absolute % 100).astype(str).str.zfill(2)
+    text = text.where(cents >= 0, "-" + text)
+    return text.astype(object).where(cents.notna(), "")
+
+
+def text_values(series):
+    return series.astype(object).where(series.notna(), "").astype(str)
+
+
+def apply_schema(df):
+    # Cast already-parsed job values to the compact in-memory schema
+    df = df.copy()
+    for column in DATE_COLUMNS:
+        df[column] = pd.to_datetime(df[column]).dt.normalize()
+    for column in TEXT_COLUMNS:
+        df[column] = text_values(df[column])
+    df["Price"] = df["Price"].astype("Int64")
+    df["Status"] = pd.Categorical(df["Status"], categories=STATUS_CATEGORIES, ordered=True)
+    df["Location"] = text_values(df["Location"]).astype("category")
+    if "Days in Shop" not in df:
+        df["Days in Shop"] = compute_days_in_shop(df["Production Date"])
+    df["Days in Shop"] = df["Days in Shop"].astype("int16")
+    return df[COLUMNS]
+
+
+def to_model(raw):
+    # Build the typed job table from what a store returns (workbook text, numbers or dates)
+    df = raw.reindex(columns=[column for column in COLUMNS if column != "Days in Shop"]).copy()
+    for column in DATE_COLUMNS:
+        df[column] = pd.to_datetime(df[column], format="ISO8601")
+    df["Price"] = parse_prices(df["Price"])
+    df["Days in Shop"] = compute_days_in_shop(df["Production Date"])
+    return apply_schema(df)
+
+
+def to_storage(df):
+    # Plain text/number columns for writing to a workbook or database
+    stored = pd.DataFrame(index=df.index)
+    for column in COLUMNS:
+        if column in DATE_COLUMNS:
+            stored[column] = df[column].dt.strftime("%Y-%m-%d").astype(object).where(df[column].notna(), "")
+        elif column == "Price":
+            stored[column] = format_prices(df[column])
+        elif column == "Days in Shop":
+            stored[column] = df[column].astype(int)
+        else:
+            stored[column] = text_values(df[column])
+    return stored
+
+
+def sort_keys(df, column=None):
+    # One comparable value per row for sorting by `column`; None is the default order (open jobs first, then by
+    # Days in Shop). Text sorts case-insensitively and blanks/missing values sort last.
+    if column is None:
+        return df["Status"].cat.codes.to_numpy(dtype="int64") * 65536 + df["Days in Shop"].to_numpy(dtype="int64") + 32768
+    values = df[column]
+    if column in DATE_COLUMNS or column == "Price":
+        missing = values.isna().to_numpy()
+        keys = values.to_numpy(dtype="datetime64[ns]").view("int64") if column in DATE_COLUMNS else values.to_numpy(dtype="int64", na_value=0)
+        return np.where(missing, np.iinfo(np.int64).max, keys)
+    if column == "Status":
+        return values.cat.codes.to_numpy(dtype="int64")
+    if column == "Days in Shop":
+        return values.to_numpy(dtype="int64")
+    text = text_values(values).str.lower()
+    return np.where(text.str.strip() == "", "\uffff", text.to_numpy(dtype=object)).astype(object)
+
+
+def format_rows(df):
+    # Display strings for Treeview rows and reports, in COLUMNS order
+    display = to_storage(df)
+    display["Days in Shop"] = display["Days in Shop"].astype(str)
+    return display
+
+
+def parse_job_fields(values):
+    # Validates entered job fields and returns typed values; raises ValueError with a user-facing message
+    # Only the fields given are checked, so a single field can be validated on its own
+    parsed = {label: str(value).strip() for label, value in values.items()}
+    for label in DATE_COLUMNS:
+        if label not in parsed:
+            continue
+        try:
+            parsed[label] = pd.to_datetime(parsed[label], format="%Y-%m-%d")
+        except ValueError:
+            raise ValueError(f"{label} must be in YYYY-MM-DD format.")
+        if pd.isna(parsed[label]) and label in REQUIRED_DATE_COLUMNS:
+            raise ValueError(f"{label} must be in YYYY-MM-DD format.")  # Blank; a job without these can't be aged
+    if "Price" in parsed:
+        try:
+            parsed["Price"] = parse_price(parsed["Price"])
+        except ValueError:
+            raise ValueError("Price must be a number, like $200.00.")
+    if "Notes" in values:
+        parsed["Notes"] = str(values["Notes"]).strip()
+    return parsed
+
+
+def job_problems(raw):
+    # Bulk checks for imported rows in stored form (text, as a workbook or CSV holds them): (row label, message)
+    # for every value the app wouldn't accept. Blank prices, statuses and Completed Dates are allowed, as in the app.
+    problems = []
+    for column in DATE_COLUMNS:
+        text = text_values(raw[column]).str.strip()
+        dates = pd.to_datetime(text.where(text != "", None), format="ISO8601", errors="coerce")
+        invalid = dates.isna() if column in REQUIRED_DATE_COLUMNS else (text != "") & dates.isna()
+        problems += [(row_label, f"{column} must be in YYYY-MM-DD format.") for row_label in raw.index[invalid]]
+    text = text_values(raw["Price"]).str.strip()
+    problems += [(row_label, "Price must be a number, like $200.00.") for row_label in raw.index[(text != "") & parse_prices(raw["Price"]).isna()]]
+    text = text_values(raw["Status"]).str.strip()
+    problems += [(row_label, f"Status must be {' or '.join(STATUS_CATEGORIES)}.") for row_label in raw.index[(text != "") & ~text.isin(STATUS_CATEGORIES)]]
+    return sorted(problems, key=lambda problem: problem[0])
+
+
+def job_number_index(df):
+    # Map each stripped Job Number to its DataFrame row label so lookups don't scan the column
+    keys = df["Job Number"].astype(str).str.strip()
+    return dict(zip(keys, df.index))
+
+
+def new_job_frame(fields, row_label):
+    # One typed row for a new job
+    fields = dict(fields)
+    fields.setdefault("Status", "Not Done")
+    fields.setdefault("Completed Date", pd.NaT)
+    fields["Days in Shop"] = days_since(fields["Production Date"])
+    return apply_schema(pd.DataFrame([fields], index=[row_label]))
+
+
+def status_values(status, today=None):
+    # Typed values for marking jobs `status`: Done stamps the day the job was finished, Not Done clears it
+    today = pd.Timestamp.now().normalize() if today is None else today
+    return {"Status": status, "Completed Date": today if status == "Done" else pd.NaT}
+
+
+def ensure_category(df, column, value):
+    # Categorical columns only accept known values; grow the categories when a new one shows up
+    if isinstance(df[column].dtype, pd.CategoricalDtype) and not pd.isna(value) and value not in df[column].cat.categories:
+        df[column] = df[column].cat.add_categories([value])
+
+
+def set_job_values(df, row_label, values):
+    # Assigns typed values to one row
+    for column, value in values.items():
+        ensure_category(df, column, value)
+        df.at[row_label, column] = value
+
+
+def set_jobs_values(df, row_labels, values):
+    # Assigns the same typed values to every listed row in one vectorized step per column
+    for column, value in values.items():
+        ensure_category(df, column, value)
+        df.loc[row_labels, column] = value
+
+
+def append_jobs(df, new_rows):
+    # Concatenate typed tables without letting mismatched categories fall back to object columns
+    new_rows = new_rows.copy()
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype) and not df[column].cat.ordered:
+            categories = df[column].cat.categories.union(new_rows[column].cat.categories, sort=False)
+            if len(categories) != len(df[column].cat.categories):
+                df[column] = df[column].cat.set_categories(categories)
+            new_rows[column] = new_rows[column].cat.set_categories(categories)
+    return pd.concat([df, new_rows])
+
+
+def upsert_stored_rows(df, rows):
+    # Applies rows in stored form (row label -> column values, as to_storage writes them) to the typed table:
+    # known labels are updated column by column, new ones appended. Returns the table, a new one if rows were added.
+    if not rows:
+        return df
+    typed = to_model(pd.DataFrame.from_dict(rows, orient="index"))
+    known = typed.index.isin(df.index)
+    updated = typed.index[known]
+    if len(updated):
+        for column in COLUMNS:
+            values = typed.loc[updated, column]
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                missing = pd.Index(values.dropna().unique()).difference(df[column].cat.categories)
+                if len(missing):
+                    df[column] = df[column].cat.add_categories(missing)
+                values = values.astype(object)
+            df.loc[updated, column] = values.to_numpy()
+    if not known.all():
+        df = append_jobs(df, typed[~known])
+    return df
+
+
+def diff_jobs(local, other):
+    # Row-level differences keyed on Job Number: (changed, added, removed). changed maps local row labels to the
+    # other table's values and added lists the other table's new rows, both in stored form; removed lists local
+    # row labels the other table doesn't have. None if Job Numbers don't identify rows one to one on both sides.
+    columns = [column for column in COLUMNS if column != "Days in Shop"]
+    local_keys = pd.Index(text_values(local["Job Number"]).str.strip())
+    other_keys = pd.Index(text_values(other["Job Number"]).str.strip())
+    if local_keys.has_duplicates or other_keys.has_duplicates:
+        return None
+    local_stored = to_storage(local)[columns].set_axis(local_keys)
+    other_stored = to_storage(other)[columns].set_axis(other_keys)
+
+    common = local_keys.intersection(other_keys)
+    differs = (local_stored.loc[common] != other_stored.loc[common]).any(axis=1).to_numpy()
+    changed_keys = common[differs]
+    changed_labels = local.index[local_keys.get_indexer(changed_keys)]
+    changed = dict(zip(changed_labels.tolist(), other_stored.loc[changed_keys].to_dict("records")))
+    added = other_stored[~other_keys.isin(local_keys)].to_dict("records")
+    removed = local.index[~local_keys.isin(other_keys)].tolist()
+    return changed, added, removed
@@ -0,0 +1,319 @@
+import argparse
+import asyncio
+import json
+import queue
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from collections import deque
+
+import pandas as pd
+
+from job_model import to_model, to_storage, upsert_stored_rows
+from save_worker import SaveWorker
+from storage import JobStore, open_store
+
+DEFAULT_PORT = 8765
+
+# The server writes the store once changes have been quiet this long
+SERVER_SAVE_DELAY_SECONDS = 2.0
+
+# Changes kept for clients that reconnect; one that missed more than this reloads everything
+EVENT_HISTORY = 1000
+
+# Idle event streams get a ping this often, so a dropped client is noticed and closed
+PING_SECONDS = 15
+
+# A client whose event stream drops tries again after this long
+RECONNECT_SECONDS = 2.0
+
+REQUEST_TIMEOUT_SECONDS = 30
+
+# Row labels a client reserves at a time, so adding a job takes one from hand instead of asking the server;
+# another block is fetched in the background once half are used
+LABEL_BLOCK = 100
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+def split_table(df):
+    # Typed jobs -> JSON-ready {"index", "columns", "data"} in stored form
+    return to_storage(df).to_dict("split")
+
+
+def join_table(table):
+    return pd.DataFrame(table["data"], index=pd.Index(table["index"], dtype="int64"), columns=table["columns"])
+
+
+def parse_rows(rows):
+    # JSON object keys are strings; row labels are ints everywhere else
+    return {int(row_label): values for row_label, values in rows.items()}
+
+
+class JobServer:
+    # Holds one job table in memory for every station and writes it to the store on its own schedule, through the
+    # same SaveWorker the app uses. Stations read and write over a small HTTP JSON API:
+    #   GET  /jobs              {"version", "table": split stored table}
+    #   POST /changes           {"snapshot": table or null, "rows": {label: stored values}, "deleted": [labels]}
+    #   POST /labels            {"count": n} -> {"first": label}; n fresh row labels for new jobs
+    #   GET  /events?since=v    newline-delimited JSON change events after version v, kept open
+    # Each change is numbered and pushed to every open event stream as {"version", "origin", "rows", "deleted"},
+    # or {"version", "origin", "reload": true} after a snapshot. "origin" is the X-Client-Id of the writer.
+    # Everything runs on the event loop thread, so the table needs no locking.
+    def __init__(self, store_path, save_delay=SERVER_SAVE_DELAY_SECONDS):
+        self.store = open_store(store_path)
+        self.df = to_model(self.store.load())
+        self.label_floor = self.store.next_row_label(self.df)
+        self.version = 0
+        self.history = deque(maxlen=EVENT_HISTORY)
+        self.subscribers = set()  # One asyncio.Queue per open event stream
+        self.save_worker = SaveWorker(self.store, delay=save_delay)
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT, started=None):
+        server = await asyncio.start_server(self.handle, host, port)
+        if started is not None:
+            started(server)  # Gets the bound server, e.g. to learn the port when it was 0
+        saves = asyncio.create_task(self.watch_saves())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            saves.cancel()
+            self.save_worker.stop()
+
+    async def watch_saves(self):
+        while True:
+            for state, detail in self.save_worker.drain():
+                if state == "error":
+                    print(f"Could not save {self.store.path}: {detail}")
+            await asyncio.sleep(1)
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if len(request_line) < 2:
+                return
+            body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+            method, target = request_line[0], urllib.parse.urlsplit(request_line[1])
+            query = dict(urllib.parse.parse_qsl(target.query))
+            origin = headers.get("x-client-id")
+
+            if target.path == "/events" and method == "GET":
+                await self.stream_events(writer, int(query.get("since", 0)))
+                return
+            try:
+                status, payload = self.route(method, target.path, json.loads(body) if body else {}, origin)
+            except (ValueError, KeyError, TypeError) as error:
+                status, payload = 400, {"error": str(error)}
+            except Exception as error:
+                status, payload = 500, {"error": str(error)}
+            await self.respond(writer, status, payload)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def route(self, method, path, request, origin):
+        if path == "/jobs":
+            if method != "GET":
+                return 405, {"error": "GET only"}
+            return 200, {"version": self.version, "table": split_table(self.df)}
+        if path == "/changes":
+            if method != "POST":
+                return 405, {"error": "POST only"}
+            self.apply_changes(request, origin)
+            return 200, {"version": self.version}
+        if path == "/labels":
+            if method != "POST":
+                return 405, {"error": "POST only"}
+            count = int(request.get("count", 1))
+            first = max(self.label_floor, self.store.next_row_label(self.df))
+            self.label_floor = first + count
+            return 200, {"first": int(first)}
+        return 404, {"error": f"No such resource: {path}"}
+
+    def apply_changes(self, request, origin):
+        if request.get("snapshot") is not None:
+            self.df = to_model(join_table(request["snapshot"]))
+            self.save_worker.request(df=self.df)
+            self.publish({"origin": origin, "reload": True})
+        deleted = [row_label for row_label in map(int, request.get("deleted", ())) if row_label in self.df.index]
+        rows = parse_rows(request.get("rows", {}))
+        if not deleted and not rows:
+            return
+        if deleted:
+            self.df = self.df.drop(index=deleted)
+        self.df = upsert_stored_rows(self.df, rows)
+
+        # Stores that can't take row updates get the whole table; the save worker coalesces either way
+        if self.store.row_updates:
+            self.save_worker.request(rows=rows, deleted=deleted)
+        else:
+            self.save_worker.request(df=self.df)
+        self.publish({"origin": origin, "rows": {str(row_label): values for row_label, values in rows.items()}, "deleted": deleted})
+
+    def publish(self, event):
+        self.version += 1
+        event["version"] = self.version
+        self.history.append(event)
+        for subscriber in self.subscribers:
+            subscriber.put_nowait(event)
+
+    async def respond(self, writer, status, payload):
+        body = json.dumps(payload, default=str).encode()
+        writer.write(f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+
+    async def stream_events(self, writer, since):
+        subscriber = asyncio.Queue()
+        self.subscribers.add(subscriber)
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nConnection: close\r\n\r\n")
+
+            # Catch the client up from the history, or tell it to reload if it's too far behind (or ahead, after a restart)
+            oldest = self.history[0]["version"] if self.history else self.version + 1
+            if since > self.version or since + 1 < oldest:
+                backlog = [{"version": self.version, "origin": None, "reload": True}]
+            else:
+                backlog = [event for event in self.history if event["version"] > since]
+            for event in backlog:
+                writer.write(json.dumps(event, default=str).encode() + b"\n")
+            await writer.drain()
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.get(), PING_SECONDS)
+                except asyncio.TimeoutError:
+                    event = {"ping": True}
+                writer.write(json.dumps(event, default=str).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+
+
+class ServerJobStore(JobStore):
+    # A JobServer as the app's store: loads and saves go over HTTP and row updates are cheap, since the server
+    # owns the file. Changes pushed by the server for other stations are queued by a listener thread.
+    row_updates = True
+    shared = True
+
+    def __init__(self, url):
+        self.path = url.rstrip("/")
+        self.client_id = uuid.uuid4().hex
+        self.version = 0
+        self.changes = queue.Queue()
+        self.listener = None
+        self.labels = deque()  # Reserved row labels not used yet
+        self.label_lock = threading.Lock()
+        self.label_error = None  # Why the last reservation failed
+        self.reserving = False
+
+    def call(self, method, path, payload=None):
+        data = None if payload is None else json.dumps(payload, default=str).encode()
+        request = urllib.request.Request(f"{self.path}{path}", data=data, method=method, headers={"Content-Type": "application/json", "X-Client-Id": self.client_id})
+        try:
+            with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT_SECONDS) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as error:
+            raise OSError(f"Job server error {error.code}: {error.read().decode(errors='replace')}") from error
+
+    def load(self):
+        response = self.call("GET", "/jobs")
+        self.version = response["version"]
+        if self.listener is None:
+            self.listener = threading.Thread(target=self.listen, name="job-server-events", daemon=True)
+            self.listener.start()
+        if not self.labels:
+            self.reserve_labels()
+        return join_table(response["table"])
+
+    def write(self, batch):
+        self.call("POST", "/changes", {
+            "snapshot": None if batch.snapshot is None else split_table(batch.snapshot),
+            "rows": {str(row_label): values for row_label, values in batch.rows.items()},
+            "deleted": [int(row_label) for row_label in batch.deleted],
+        })
+
+    def next_row_label(self, df, count=1):
+        # Handed out by the server, so two stations adding jobs at once never pick the same labels. Single
+        # labels come from the reserved block; if that ran out because the server can't be reached, this
+        # fails at once rather than making the window wait for a timeout.
+        if count == 1:
+            with self.label_lock:
+                label = self.labels.popleft() if self.labels else None
+                error = self.label_error
+                refill = len(self.labels) < LABEL_BLOCK // 2 and not self.reserving
+                self.reserving = self.reserving or refill
+            if refill:
+                threading.Thread(target=self.reserve_labels, name="label-reserver", daemon=True).start()
+            if label is not None:
+                return label
+            if error is not None:
+                raise OSError(f"Could not get row labels from {self.path}: {error}")
+        return self.call("POST", "/labels", {"count": count})["first"]
+
+    def reserve_labels(self):
+        try:
+            first = self.call("POST", "/labels", {"count": LABEL_BLOCK})["first"]
+            with self.label_lock:
+                self.labels.extend(range(first, first + LABEL_BLOCK))
+                self.label_error = None
+        except (OSError, ValueError) as error:
+            with self.label_lock:
+                self.label_error = error
+        finally:
+            with self.label_lock:
+                self.reserving = False
+
+    def listen(self):
+        # The server pings idle streams, so a stream silent for two ping intervals is dead (say, a half-open
+        # connection after the server's host dropped off the network); the read times out and we reconnect
+        while True:
+            try:
+                with urllib.request.urlopen(f"{self.path}/events?since={self.version}", timeout=PING_SECONDS * 2) as response:
+                    for line in response:
+                        event = json.loads(line)
+                        if "version" not in event:
+                            continue  # Ping
+                        self.version = event["version"]
+                        if event.get("origin") != self.client_id:
+                            self.changes.put(event)
+            except (OSError, ValueError):
+                pass
+            time.sleep(RECONNECT_SECONDS)
+
+    def drain_changes(self):
+        changes = []
+        while True:
+            try:
+                changes.append(self.changes.get_nowait())
+            except queue.Empty:
+                return changes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve one job store to every station on the network.")
+    parser.add_argument("file", nargs="?", default="jobs.xlsx", help="workbook (.xlsx) or SQLite database (.db) to serve")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (0.0.0.0 for every interface)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--save-delay", type=float, default=SERVER_SAVE_DELAY_SECONDS, help="seconds of quiet before changes are written")
+    args = parser.parse_args()
+
+    server = JobServer(args.file, save_delay=args.save_delay)
+    print(f"Serving {len(server.df)} jobs from {args.file} on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
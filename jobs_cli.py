@@ -0,0 +1,218 @@
+import argparse
+import datetime
+import os
+import sys
+import time
+
+import pandas as pd
+
+from job_model import append_jobs, job_number_index, job_problems, set_jobs_values, status_values, text_values, to_model, to_storage
+from pdf_report import build_undone_report, undone_jobs
+from storage import STORED_COLUMNS, SaveBatch, open_store
+
+# Rows read, checked and converted at a time while importing
+IMPORT_CHUNK_ROWS = 10000
+
+# Problems listed before the rest are summed up
+MAX_PROBLEMS_SHOWN = 20
+
+# Columns an imported file may leave out; a missing Status means Not Done
+OPTIONAL_IMPORT_COLUMNS = ["Status", "Completed Date"]
+
+
+def cell_text(value):
+    # Workbook cells as the text a CSV would hold: dates as YYYY-MM-DD, whole numbers without ".0"
+    if value is None:
+        return ""
+    if isinstance(value, datetime.datetime):
+        return value.strftime("%Y-%m-%d") if value.time() == datetime.time() else value.isoformat(sep=" ")
+    if isinstance(value, datetime.date):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def read_chunks(path, chunk_rows=IMPORT_CHUNK_ROWS):
+    # Yields the rows of a CSV or xlsx file as text DataFrames of up to `chunk_rows` rows, labelled with their
+    # line (row) number in the file, so a large file never has to be held whole
+    if os.path.splitext(path)[1].lower() == ".csv":
+        line = 2
+        for chunk in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_rows):
+            chunk.index = pd.RangeIndex(line, line + len(chunk))
+            line += len(chunk)
+            yield chunk
+        return
+
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [cell_text(value).strip() for value in next(rows, ())]
+        line, batch = 2, []
+        for row in rows:
+            batch.append([cell_text(value) for value in row])
+            if len(batch) == chunk_rows:
+                yield pd.DataFrame(batch, columns=header, index=pd.RangeIndex(line, line + len(batch)))
+                line, batch = line + len(batch), []
+        if batch:
+            yield pd.DataFrame(batch, columns=header, index=pd.RangeIndex(line, line + len(batch)))
+    finally:
+        workbook.close()
+
+
+def load_jobs(store):
+    return to_model(store.load())
+
+
+def save_jobs(store, df, row_labels):
+    # Stores that take row updates get just the changed rows; a workbook is rewritten whole
+    batch = SaveBatch()
+    if store.row_updates:
+        for row_label, values in to_storage(df.loc[list(row_labels)]).to_dict("index").items():
+            batch.upsert(row_label, values)
+    else:
+        batch.replace_all(df)
+    store.write(batch)
+
+
+def report_problems(problems):
+    for line, message in problems[:MAX_PROBLEMS_SHOWN]:
+        print(f"  line {line}: {message}", file=sys.stderr)
+    if len(problems) > MAX_PROBLEMS_SHOWN:
+        print(f"  ... and {len(problems) - MAX_PROBLEMS_SHOWN} more", file=sys.stderr)
+
+
+def import_jobs(store, source, chunk_rows=IMPORT_CHUNK_ROWS, skip_invalid=False):
+    # Adds the jobs in a CSV or xlsx file to the store. Every chunk is checked as it's read: values the app
+    # wouldn't accept, and Job Numbers already in the store or earlier in the file. Nothing is written if any row
+    # has a problem, unless `skip_invalid` is set; then only the good rows are added. Returns the rows added.
+    df = load_jobs(store)
+    existing = set(job_number_index(df)) - {""}
+    seen = set(existing)
+    accepted, problems, total = [], [], 0
+    for chunk in read_chunks(source, chunk_rows):
+        missing = [column for column in STORED_COLUMNS if column not in OPTIONAL_IMPORT_COLUMNS and column not in chunk.columns]
+        if missing:
+            raise ValueError(f"{source} has no {', '.join(missing)} column{'s' if len(missing) > 1 else ''}")
+        chunk = chunk.reindex(columns=STORED_COLUMNS, fill_value="")
+        total += len(chunk)
+
+        chunk_problems = job_problems(chunk)
+        keys = text_values(chunk["Job Number"]).str.strip()
+        for line, key in keys[(keys != "") & (keys.isin(seen) | keys.duplicated())].items():
+            chunk_problems.append((line, f"Job Number {key} already exists." if key in existing else f"Job Number {key} appears more than once in {source}."))
+        bad = {line for line, _ in chunk_problems}
+        good = chunk[~chunk.index.isin(bad)]
+        seen.update(keys[good.index][keys[good.index] != ""])
+        problems += sorted(chunk_problems)
+        accepted.append(good)
+        print(f"Checked {total} rows...", file=sys.stderr)
+
+    if problems:
+        print(f"{len(problems)} problems in {source}:", file=sys.stderr)
+        report_problems(problems)
+        if not skip_invalid:
+            raise ValueError("Nothing imported; fix the rows above or pass --skip-invalid")
+    new_jobs = pd.concat(accepted) if accepted else pd.DataFrame(columns=STORED_COLUMNS)
+    if not len(new_jobs):
+        return 0
+
+    # Typed once, so the new rows share one set of categories; new jobs start out Not Done
+    new_jobs["Status"] = new_jobs["Status"].str.strip().replace("", "Not Done")
+    new_jobs = to_model(new_jobs)
+    first = store.next_row_label(df, count=len(new_jobs))
+    new_jobs.index = pd.RangeIndex(first, first + len(new_jobs))
+    df = append_jobs(df, new_jobs)
+    save_jobs(store, df, new_jobs.index)
+    return len(new_jobs)
+
+
+def read_job_numbers(path):
+    # One Job Number per line; "-" reads them from standard input
+    lines = sys.stdin if path == "-" else open(path)
+    try:
+        return [line.strip() for line in lines if line.strip()]
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+
+
+def set_status(store, job_numbers, status):
+    # Marks the listed jobs in one vectorized update and one write; returns (changed, unknown Job Numbers)
+    df = load_jobs(store)
+    index = job_number_index(df)
+    unknown = [job_number for job_number in job_numbers if job_number.strip() not in index]
+    row_labels = pd.Index([index[job_number.strip()] for job_number in job_numbers if job_number.strip() in index]).unique()
+    changed = row_labels[(df.loc[row_labels, "Status"] != status).to_numpy()]
+    if len(changed):
+        set_jobs_values(df, changed, status_values(status))
+        save_jobs(store, df, changed)
+    return len(changed), unknown
+
+
+def export_jobs(df, output, undone_only=False):
+    # CSV or JSON (by extension) of the jobs as the workbook holds them, with Days in Shop
+    jobs = to_storage(undone_jobs(df) if undone_only else df)
+    if os.path.splitext(output)[1].lower() == ".json":
+        jobs.to_json(output, orient="records", indent=2)
+    else:
+        jobs.to_csv(output, index=False)
+    return len(jobs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Work on the job store without the window, e.g. from a nightly script.")
+    parser.add_argument("--store", default="jobs.xlsx", help="workbook (.xlsx), SQLite database (.db) or job server address to work on")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="add the jobs in a CSV or xlsx file")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--chunk-rows", type=int, default=IMPORT_CHUNK_ROWS, help="rows read and checked at a time")
+    import_parser.add_argument("--skip-invalid", action="store_true", help="import the good rows even if others have problems")
+
+    status_parser = commands.add_parser("status", help="mark jobs Done or Not Done by Job Number")
+    status_parser.add_argument("status", choices=["done", "not-done"])
+    status_parser.add_argument("job_numbers", nargs="*", metavar="JOB_NUMBER")
+    status_parser.add_argument("--from", dest="from_file", metavar="FILE", help="file with one Job Number per line (- for standard input)")
+
+    pdf_parser = commands.add_parser("pdf", help="write the undone jobs report")
+    pdf_parser.add_argument("output", nargs="?", default="undone_jobs.pdf")
+
+    export_parser = commands.add_parser("export", help="write the jobs to a .csv or .json file")
+    export_parser.add_argument("output")
+    export_parser.add_argument("--undone", action="store_true", help="only jobs that aren't Done")
+
+    args = parser.parse_args(argv)
+    store = open_store(args.store)
+    started = time.perf_counter()
+    try:
+        if args.command == "import":
+            added = import_jobs(store, args.file, args.chunk_rows, args.skip_invalid)
+            print(f"Imported {added} jobs into {args.store}")
+        elif args.command == "status":
+            job_numbers = list(args.job_numbers) + (read_job_numbers(args.from_file) if args.from_file else [])
+            if not job_numbers:
+                parser.error("no Job Numbers given")
+            status = "Done" if args.status == "done" else "Not Done"
+            changed, unknown = set_status(store, job_numbers, status)
+            print(f"Marked {changed} jobs as {status}")
+            if unknown:
+                print(f"{len(unknown)} Job Numbers not found: {', '.join(unknown[:MAX_PROBLEMS_SHOWN])}{' ...' if len(unknown) > MAX_PROBLEMS_SHOWN else ''}", file=sys.stderr)
+                return 1
+        elif args.command == "pdf":
+            jobs = undone_jobs(load_jobs(store))
+            build_undone_report(jobs, args.output)
+            print(f"Wrote {len(jobs)} undone jobs to {args.output}")
+        elif args.command == "export":
+            exported = export_jobs(load_jobs(store), args.output, args.undone)
+            print(f"Exported {exported} jobs to {args.output}")
+    except (OSError, ValueError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    print(f"Done in {time.perf_counter() - started:.1f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,123 @@
+import argparse
+import bisect
+import importlib
+import threading
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox
-import pandas as pd
-from reportlab.lib.pagesizes import landscape, letter
-from reportlab.platypus import Table, TableStyle, SimpleDocTemplate, Paragraph
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
+from tkinter import ttk, messagebox, filedialog, simpledialog
+
+from job_columns import AGING_COLORS, COLUMNS, aging_bucket
+from performance import PerformanceMonitor, timed_action, timed_phase
+
+# How long the save worker waits for more changes before writing, and how often the UI checks on it
+SAVE_DELAY_SECONDS = 0.5
+SAVE_POLL_MS = 200
+REPORT_POLL_MS = 100
+
+# While timings are recorded, rolling stats are rewritten to this file every PERF_EXPORT_MS and on exit
+PERF_STATS_FILE = "performance_stats.json"
+PERF_EXPORT_MS = 60000
+PERF_REFRESH_MS = 1000
+
+# An open dashboard checks this often whether its totals changed
+DASHBOARD_REFRESH_MS = 500
+
+# While the jobs load on a worker thread the UI checks on it this often, then fills the list this many rows per
+# event-loop turn
+LOAD_POLL_MS = 50
+POPULATE_BATCH_ROWS = 500
+
+# How often a client of a job server applies changes pushed from other stations
+REMOTE_POLL_MS = 250
+
+# How often the workbook is checked for saves made elsewhere (Excel, another station)
+WATCH_POLL_MS = 2000
+
+# Days in Shop is recomputed just after midnight; the wait is capped so a station that slept through midnight
+# still catches up within the hour
+ROLLOVER_CHECK_MS = 3600000
+
+# Rows kept materialized above and below the visible part of a virtualized job list
+VIRTUAL_LIST_BUFFER = 50
+
+# Treeview finds positions by walking its children, so each move costs time proportional to the list. Past this
+# many moved rows (e.g. after a new sort) the whole order is handed over in one set_children call instead.
+REORDER_MOVE_LIMIT = 50
+
+# Problems listed when File -> Import from Excel refuses a workbook
+IMPORT_PROBLEMS_SHOWN = 10
+
+# The search runs once typing pauses this long; the background index build is checked this often
+SEARCH_DELAY_MS = 150
+SEARCH_POLL_MS = 100
+
+
+class LazyModule:
+    # Stands in for a module that is slow to import: pandas, numpy and the job modules built on them take about as
+    # long to import as a small workbook takes to read. The import happens on first attribute use, or ahead of time
+    # through load() on the loader thread, so the window is up before any of it is paid for.
+    def __init__(self, name):
+        self.module_name = name
+        self.module = None
+
+    def load(self):
+        if self.module is None:
+            self.module = importlib.import_module(self.module_name)
+        return self.module
+
+    def __getattr__(self, attribute):
+        return getattr(self.load(), attribute)
+
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+archive = LazyModule("archive")
+dashboard = LazyModule("dashboard")
+job_model = LazyModule("job_model")
+save_worker = LazyModule("save_worker")
+search_index = LazyModule("search_index")
+sort_orders = LazyModule("sort_orders")
+storage = LazyModule("storage")
+JOB_MODULES = (np, pd, job_model, storage, archive, dashboard, save_worker, search_index, sort_orders)
+
+
+def import_job_modules():
+    # Called on the loader thread at startup, so the first load pays for the imports there rather than the UI
+    for module in JOB_MODULES:
+        module.load()
+
+
+def longest_increasing_subsequence(sequence):
+    # Returns the indices of one longest strictly increasing subsequence (patience sorting)
+    tails = []
+    tail_indices = []
+    previous = [None] * len(sequence)
+    for i, value in enumerate(sequence):
+        k = bisect.bisect_left(tails, value)
+        if k == len(tails):
+            tails.append(value)
+            tail_indices.append(i)
+        else:
+            tails[k] = value
+            tail_indices[k] = i
+        previous[i] = tail_indices[k - 1] if k else None
+    result = set()
+    i = tail_indices[-1] if tail_indices else None
+    while i is not None:
+        result.add(i)
+        i = previous[i]
+    return result
 
 
 class JobManagementApp:
-    def __init__(self, root):
+    def __init__(self, root, file_path="jobs.xlsx", archive_after=None):
         self.root = root
         self.root.title("Job Management System")
+        self.file_path = file_path  # Workbook (.xlsx) or SQLite database (.db)
+        self.archive_after = archive_after  # Days; if set, old Done jobs are archived once loading finishes
+        self.store = None
+        self.df = None  # The job table; None until the first load finishes
+        self.perf = PerformanceMonitor()  # Action timings; off until enabled in Help -> Performance
 
         # Menu Bar
         self.menu_bar = tk.Menu(self.root)
@@ -19,32 +125,90 @@ class JobManagementApp:
         self.file_menu.add_command(label="Add New Job", command=self.open_add_job_dialog)
         self.file_menu.add_command(label="Print Undone Jobs to PDF", command=self.print_pdf)
         self.file_menu.add_separator()
-        self.file_menu.add_command(label="Exit", command=self.root.quit)
+        self.file_menu.add_command(label="Import from Excel...", command=self.import_jobs)
+        self.file_menu.add_command(label="Export to Excel...", command=self.export_jobs)
+        self.file_menu.add_command(label="Archive Done Jobs...", command=self.open_archive_dialog)
+        self.file_menu.add_separator()
+        self.file_menu.add_command(label="Exit", command=self.on_exit)
         self.menu_bar.add_cascade(label="File", menu=self.file_menu)
+
+        self.view_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.virtual_list = tk.BooleanVar(value=False)
+        self.view_menu.add_checkbutton(label="Virtualized Job List", variable=self.virtual_list, command=self.toggle_virtual_list)
+        self.include_archive = tk.BooleanVar(value=False)
+        self.view_menu.add_checkbutton(label="Include Archive", variable=self.include_archive, command=self.toggle_archive)
+        self.view_menu.add_separator()
+        self.view_menu.add_command(label="Dashboard...", command=self.open_dashboard_window)
+        self.menu_bar.add_cascade(label="View", menu=self.view_menu)
         
         self.help_menu = tk.Menu(self.menu_bar, tearoff=0)
         self.help_menu.add_command(label="About")
         self.help_menu.add_command(label="Help")
+        self.help_menu.add_command(label="Performance...", command=self.open_performance_window)
         self.menu_bar.add_cascade(label="Help", menu=self.help_menu)
         
         self.root.config(menu=self.menu_bar)
 
+        # Search Bar: filters the job list as you type
+        self.search_frame = tk.Frame(self.root)
+        self.search_frame.pack(fill=tk.X, padx=5, pady=(5, 0))
+        search_label = tk.Label(self.search_frame, text="Search:")
+        search_label.pack(side=tk.LEFT, padx=5)
+        self.search_text = tk.StringVar()
+        self.search_entry = tk.Entry(self.search_frame, textvariable=self.search_text)
+        self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.clear_search_button = tk.Button(self.search_frame, text="Clear", command=lambda: self.search_text.set(""))
+        self.clear_search_button.pack(side=tk.LEFT, padx=5)
+        self.search_index = None  # Created with the first load
+        self.search_matches = None  # Row labels matching the search, or None to show every job
+        self.search_after_id = None
+        self.search_poll_id = None
+        self.search_text.trace_add("write", self.on_search_changed)
+
         # Job List Section
         self.job_list_frame = tk.Frame(self.root)
         self.job_list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        self.columns = ("Sign Off Date", "Name", "Phone Number", "Location", "Production Date", "Price", "Notes", "Job Number", "Status", "Days in Shop")
-        self.job_tree = ttk.Treeview(self.job_list_frame, columns=self.columns, show="headings")
+        self.columns = tuple(COLUMNS)
+        self.job_scrollbar = ttk.Scrollbar(self.job_list_frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.job_tree = ttk.Treeview(self.job_list_frame, columns=self.columns, show="headings", yscrollcommand=self.on_tree_scroll)
         for col in self.columns:
-            self.job_tree.heading(col, text=col)
+            self.job_tree.heading(col, text=col, command=lambda column=col: self.sort_by(column))
             self.job_tree.column(col, width=100, anchor=tk.W)
+        self.job_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.job_tree.pack(fill=tk.BOTH, expand=True)
 
-        # Load data from Excel file
-        self.load_jobs_from_excel("jobs.xlsx")
+        # Sort orders are cached per column; sort_column None is the default (open jobs first, then by Days in Shop)
+        self.sort_orders = None  # Created with each load
+        self.sort_column = None
+        self.sort_descending = False
+
+        # Treeview items currently shown, keyed by item ID, so refreshes only touch what changed; row_items maps
+        # the row labels of unchanged shown rows to their items, so their strings don't have to be formatted again.
+        # tree_labels holds the row labels of tree_order (None if unknown) and dirty_rows the rows changed since the
+        # last refresh, so a refresh after an edit can patch just those rows (see patch_job_rows).
+        self.tree_rows = {}
+        self.tree_order = []
+        self.row_items = {}
+        self.tree_labels = None
+        self.dirty_rows = set()
+
+        # One tag per aging bucket, configured once; Done jobs are grayed out
+        for bucket, color in enumerate(AGING_COLORS):
+            self.job_tree.tag_configure(f'aging_{bucket}', background=color)
+        self.job_tree.tag_configure('done', background='lightgray', foreground='gray')
+        self.job_tree.tag_configure('conflict', foreground='red')  # Edited here and elsewhere at once; this station's edit was kept
+
+        # Virtualized list state: first visible row, first materialized row and the remembered selection
+        self.view_offset = 0
+        self.window_start = 0
+        self.selection_ids = ()
+        self.restored_selection = None
+        self.row_height = int(ttk.Style(self.root).lookup("Treeview", "rowheight") or 20)
 
         # Bind selection event
         self.job_tree.bind("<<TreeviewSelect>>", self.on_job_select)
+        self.job_tree.bind("<Configure>", self.on_tree_resize)
 
         # Job Details Section
         self.details_frame = tk.LabelFrame(self.root, text="Job Details")
@@ -79,48 +243,351 @@ class JobManagementApp:
         self.mark_not_done_button.pack(side=tk.LEFT, padx=5)
         self.delete_button = tk.Button(self.button_frame, text="Delete Job", command=self.delete_job, state=tk.DISABLED)
         self.delete_button.pack(side=tk.LEFT, padx=5)
+        self.bulk_edit_button = tk.Button(self.button_frame, text="Edit Selected...", command=self.open_bulk_edit_dialog, state=tk.DISABLED)
+        self.bulk_edit_button.pack(side=tk.LEFT, padx=5)
 
         # Footer Section
-        self.status_bar = tk.Label(self.root, text="Status: Ready", bd=1, relief=tk.SUNKEN, anchor=tk.W)
-        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
-
-        self.job_tree.tag_configure('done', background='lightgray')
-        self.job_tree.tag_configure('not_done', background='white')
-
-        self.file_path = "jobs.xlsx"  # File path for Excel
-
-    def load_jobs_from_excel(self, file_path):
-        # Load data from Excel file
-        self.df = pd.read_excel(file_path)
-
-        # Convert 'Production Date' column to datetime
-        self.df['Production Date'] = pd.to_datetime(self.df['Production Date'], format="%Y-%m-%d")
-        self.df['Sign Off Date'] = pd.to_datetime(self.df['Sign Off Date'], format="%Y-%m-%d").dt.normalize()  # Remove time component
-        
-        # Calculate 'Days in Shop'
-        current_date = pd.Timestamp.now().normalize()  # Remove time component
-        self.df['Days in Shop'] = (current_date - self.df['Production Date']).dt.days
-        
-        # Ensure 'Days in Shop' is an integer
-        self.df['Days in Shop'] = self.df['Days in Shop'].astype(int)
-
-        self.df['Production Date'] = self.df['Production Date'].dt.strftime("%Y-%m-%d")
-        self.df['Sign Off Date'] = self.df['Sign Off Date'].dt.strftime("%Y-%m-%d")
-
-        self.df['Notes'] = self.df['Notes'].fillna("")
-        self.df['Job Number'] = self.df['Job Number'].fillna("")
+        self.footer_frame = tk.Frame(self.root)
+        self.footer_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        self.save_status = tk.Label(self.footer_frame, text="All changes saved", bd=1, relief=tk.SUNKEN, anchor=tk.E, width=24)
+        self.save_status.pack(side=tk.RIGHT)
+        self.cancel_report_button = tk.Button(self.footer_frame, text="Cancel PDF", command=self.cancel_pdf)  # Shown while a report builds
+        self.load_progress = ttk.Progressbar(self.footer_frame, length=160, mode="determinate")  # Shown while the list fills
+        self.status_bar = tk.Label(self.footer_frame, text="Status: Ready", bd=1, relief=tk.SUNKEN, anchor=tk.W)
+        self.status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.report_job = None
+        self.report_started = None
+        self.perf_enabled = tk.BooleanVar(value=False)
+        self.perf_export_id = None
+        self.performance_window = None
+        self.dashboard = None  # Shop totals; created with each load and built the first time they're shown
+        self.dashboard_window = None
+
+        # Saves happen on a background thread, started once the jobs are loaded; make sure they reach disk before
+        # the window closes
+        self.save_worker = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_exit)
+
+        # Saves made to the workbook elsewhere are read and diffed on a worker thread, then merged row by row
+        self.file_changes = None  # (changes, error) left by the worker
+        self.remote_reload = None  # (stored jobs, error) left by the job server reloader
+        self.reloading_remote = False
+        self.reading_file_changes = False
+        self.saved_while_reading = False
+
+        # The window comes up empty; the jobs are read on a worker thread and the list fills in batches
+        self.loaded = None
+        self.populate_id = None
+        self.start_loading(self.file_path)
+
+    def start_loading(self, file_path):
+        self.set_loading(True)
+        self.status_bar.config(text=f"Status: Loading {file_path}...")
+        threading.Thread(target=self.read_jobs, args=(file_path,), name="job-loader", daemon=True).start()
+        self.root.after(LOAD_POLL_MS, self.poll_loading)
+
+    def read_jobs(self, file_path):
+        # Loader thread: imports, disk read and the typed table; touches neither Tk nor the app's own state
+        try:
+            import_job_modules()
+            store = storage.open_store(file_path)
+            df = job_model.to_model(store.load())
+            self.loaded = (store, df, job_model.job_number_index(df), None)
+        except Exception as error:
+            self.loaded = (None, None, None, error)
+
+    def poll_loading(self):
+        if self.loaded is None:
+            self.root.after(LOAD_POLL_MS, self.poll_loading)
+            return
+        (store, df, job_index, error), self.loaded = self.loaded, None
+        if error is not None:
+            self.status_bar.config(text=f"Status: Could not load {self.file_path}: {error}")
+            messagebox.showerror("Load Failed", f"Could not load {self.file_path}: {error}")
+            return
 
+        self.use_store(store)
+        self.df = df
+        self.job_index = job_index
+        self.reset_job_state()
+        self.save_worker = save_worker.SaveWorker(self.store, delay=SAVE_DELAY_SECONDS)
+        self.root.after(SAVE_POLL_MS, self.poll_save_worker)
+        if self.store.shared:
+            self.root.after(REMOTE_POLL_MS, self.poll_remote_changes)
+        elif self.store.file_stamp() is not None:
+            self.store.check_stamp = True  # Saves must not overwrite changes that haven't been merged yet
+            self.root.after(WATCH_POLL_MS, self.poll_file_changes)
+        self.schedule_rollover()
+        self.set_loading(False)
+
+        self.sorted_order = self.sort_orders.order(self.df, self.sort_column, self.sort_descending)
+        self.display_order = self.filtered_order()
+        self.populate_job_rows()
+
+    def set_loading(self, loading):
+        # Nothing that needs the job table can be used until it's there
+        state = tk.DISABLED if loading else tk.NORMAL
+        for menu in ("File", "View"):
+            self.menu_bar.entryconfig(menu, state=state)
+        for widget in (self.search_entry, self.clear_search_button, self.edit_button, self.mark_done_button, self.mark_not_done_button):
+            widget.config(state=state)
+
+    def populate_job_rows(self):
+        # First fill of the list after a background load: one batch of rows per event-loop turn, so the window
+        # stays responsive and shows progress. A redraw in the meantime (a sort, search or edit) takes over.
+        self.job_tree.delete(*self.job_tree.get_children())
+        self.tree_rows = {}
+        self.tree_order = []
+        self.row_items = {}
+        self.tree_labels = None
+        start, end = self.visible_window()
+        self.window_start = start
+        self.populate_labels = self.display_order[start:end].tolist()
+        self.populate_position = 0
+        self.load_progress.config(maximum=max(1, len(self.populate_labels)), value=0)
+        self.load_progress.pack(side=tk.RIGHT, padx=5)
+        self.populate_id = self.root.after(1, self.populate_batch)
+
+    def populate_batch(self):
+        labels = self.populate_labels[self.populate_position:self.populate_position + POPULATE_BATCH_ROWS]
+        for row_label, (item_id, values, tags) in zip(labels, self.format_job_rows(labels)):
+            self.job_tree.insert("", tk.END, iid=item_id, values=values, tags=tags)
+            self.tree_rows[item_id] = (values, tags)
+            self.tree_order.append(item_id)
+            self.row_items[row_label] = item_id
+        self.populate_position += len(labels)
+        self.load_progress.config(value=self.populate_position)
+        if self.populate_position < len(self.populate_labels):
+            self.status_bar.config(text=f"Status: Loading jobs... {self.populate_position} of {len(self.populate_labels)}")
+            self.populate_id = self.root.after(1, self.populate_batch)
+            return
+        self.populate_id = None
+        self.tree_labels = self.display_order[self.window_start:self.window_start + len(self.tree_order)].copy()
+        self.finish_loading()
 
-        # Update Treeview
-        self.update_treeview()
+    def stop_populating(self):
+        # The caller redraws the whole list itself, so the batched fill is no longer needed
+        if self.populate_id is None:
+            return
+        self.root.after_cancel(self.populate_id)
+        self.populate_id = None
+        self.root.after_idle(self.finish_loading)
+
+    def finish_loading(self):
+        self.load_progress.pack_forget()
+        if self.virtual_list.get():
+            self.update_scrollbar()
+        self.status_bar.config(text=f"Status: Loaded {len(self.df)} jobs")
+        self.start_search_index()
+        self.perf.sample_memory(self.df)
+        if self.archive_after is not None:
+            archived = self.archive_old_jobs(self.archive_after)
+            self.archive_after = None
+            if archived:
+                self.status_bar.config(text=f"Status: Loaded {len(self.df)} jobs; archived {archived} older Done jobs")
+
+    def use_store(self, store):
+        self.store = store
+        self.file_path = store.path
+        self.archive = None if store.shared else archive.JobArchive(store.path)
+
+    def load_jobs_from_excel(self, file_path, stored=None):
+        # Load in the foreground through the storage backend for this path (Excel workbook or SQLite database);
+        # `stored` is a table already read on another thread
+        import_job_modules()
+        if self.store is None or self.store.path != file_path:
+            self.use_store(storage.open_store(file_path))
+        with self.perf.action("load jobs"):
+            with self.perf.phase("disk read"):
+                self.df = self.store.load() if stored is None else stored
+            self.prepare_jobs()
+
+            # Update Treeview
+            self.update_treeview()
+        self.start_search_index()
+        self.perf.sample_memory(self.df)
+
+    def prepare_jobs(self):
+        # Convert the stored columns to the typed job model (dates, categories, price in cents, Days in Shop)
+        with self.perf.phase("model update"):
+            self.df = job_model.to_model(self.df)
+
+            # Build the Job Number -> row lookup
+            self.rebuild_job_index()
+        self.reset_job_state()
+
+    def reset_job_state(self):
+        # Caches and views of the previous table don't apply to a newly loaded one
+        self.sort_orders = sort_orders.SortOrders()
+        self.dashboard = dashboard.ShopDashboard()
+        if self.search_index is None:
+            self.search_index = search_index.JobSearchIndex()
+        self.row_items = {}
+        self.tree_labels = None
+        self.dirty_rows = set()
+        self.search_matches = None
+
+        # Rows changed or deleted here and not yet written, and rows whose edit here won over one made elsewhere
+        self.unsaved_rows = set()
+        self.unsaved_deletes = set()  # Job Numbers
+        self.conflict_rows = set()
+
+        # Days in Shop was computed as of today
+        self.days_as_of = pd.Timestamp.now().normalize()
+
+        # A fresh table never has the archive mixed in
+        self.archived_rows = pd.Index([], dtype="int64")
+        self.include_archive.set(False)
+
+    def schedule_rollover(self):
+        now = pd.Timestamp.now()
+        until_midnight = (now.normalize() + pd.Timedelta(days=1) - now) // pd.Timedelta(milliseconds=1)
+        self.root.after(min(until_midnight + 1000, ROLLOVER_CHECK_MS), self.roll_over_days)
+
+    def roll_over_days(self):
+        # A new day: Days in Shop goes up for every job, in one pass over the column. Shown rows get their Days in
+        # Shop cell rewritten, and only those that crossed into another aging bucket get new tags.
+        self.schedule_rollover()
+        today = pd.Timestamp.now().normalize()
+        if today == self.days_as_of:
+            return
+        self.days_as_of = today
+        with self.perf.action("days rollover"):
+            with self.perf.phase("model update"):
+                self.df["Days in Shop"] = job_model.compute_days_in_shop(self.df["Production Date"], today)
+
+            # Orders and totals keyed on Days in Shop are redone; the dashboard rebuilds when next shown
+            self.sort_orders.discard(None, "Days in Shop")
+            self.dashboard = dashboard.ShopDashboard()
+            self.refresh_days_cells()
+            if self.sort_column in (None, "Days in Shop"):
+                self.update_treeview()
+
+    @timed_phase("list refresh")
+    def refresh_days_cells(self):
+        row_labels = list(self.row_items)
+        if not row_labels:
+            return
+        jobs = self.df.loc[row_labels, ["Status", "Days in Shop"]]
+        days_column = self.columns.index("Days in Shop")
+        for row_label, status, days, bucket in zip(row_labels, jobs["Status"], jobs["Days in Shop"].astype(str), job_model.aging_buckets(jobs["Days in Shop"])):
+            item_id = self.row_items[row_label]
+            values, tags = self.tree_rows[item_id]
+            new_tags = self.row_tags(row_label, status, bucket)
+            if values[days_column] == days and tags == new_tags:
+                continue
+            values = values[:days_column] + (days,) + values[days_column + 1:]
+            if tags == new_tags:
+                self.job_tree.set(item_id, "Days in Shop", days)
+            else:
+                self.job_tree.item(item_id, values=values, tags=new_tags)
+            self.tree_rows[item_id] = (values, new_tags)
+
+    def start_search_index(self):
+        # Index the searchable text in the background once the list is up; an active search is re-run when it's ready
+        self.search_index.build(self.df)
+        if self.search_poll_id is None:
+            self.search_poll_id = self.root.after(SEARCH_POLL_MS, self.poll_search_index)
+
+    def rebuild_job_index(self):
+        self.job_index = job_model.job_number_index(self.df)
+
+    def index_job(self, job_number, row_label):
+        self.job_index[str(job_number).strip()] = row_label
+
+    def unindex_job(self, job_number):
+        self.job_index.pop(str(job_number).strip(), None)
+
+    @timed_phase("lookup")
+    def find_job_row(self, job_number):
+        # Returns the DataFrame row label for a job, or None if it isn't loaded
+        return self.job_index.get(str(job_number).strip())
+
+    def jobs_changed(self, row_labels, deleted=False):
+        # Keep the cached sort orders, display strings, dashboard totals and the search index current after an add,
+        # edit or delete; returns True if the active search's matches changed
+        self.forget_rows(row_labels)
+        with self.perf.phase("sort"):
+            if deleted:
+                self.sort_orders.remove_rows(row_labels)
+            else:
+                self.sort_orders.update_rows(self.df, list(row_labels))
+        with self.perf.phase("dashboard"):
+            if deleted:
+                self.dashboard.remove_rows(row_labels)
+            else:
+                self.dashboard.update_rows(self.df, row_labels, excluded=self.archived_rows)
+        return self.reindex_jobs(row_labels, deleted)
+
+    def forget_rows(self, row_labels):
+        # Shown strings and positions of these rows are out of date; the next refresh redraws them
+        for row_label in row_labels:
+            self.row_items.pop(row_label, None)
+        self.dirty_rows.update(row_labels)
+
+    @timed_phase("search index")
+    def reindex_jobs(self, row_labels, deleted=False):
+        if deleted:
+            self.search_index.remove_rows(row_labels)
+        else:
+            self.search_index.update_rows(self.df.loc[list(row_labels)])
+        if self.search_matches is None:
+            return False
+        matches = self.search_index.search(self.search_text.get())
+        changed = matches is None or not np.array_equal(matches, self.search_matches)
+        self.search_matches = matches
+        return changed
+
+    def next_row_label(self):
+        # The store picks it: after the largest label, or from a job server so stations don't clash
+        return self.store.next_row_label(self.df)
+
+    @timed_phase("lookup")
+    def row_for_item(self, item_id):
+        # Treeview item IDs encode either the Job Number or the DataFrame row label
+        kind, _, key = item_id.partition(":")
+        if kind == "job":
+            return self.find_job_row(key)
+        if kind == "row" and int(key) in self.df.index:
+            return int(key)
+        return None
+
+    def row_values(self, row_label):
+        # Display strings for one job, in column order
+        return tuple(job_model.format_rows(self.df.loc[[row_label]]).iloc[0])
+
+    def selected_rows(self):
+        # DataFrame row labels of every selected job, in selection order
+        row_labels = []
+        for item_id in self.selected_item_ids():
+            row_label = self.row_for_item(item_id)
+            if row_label is not None and row_label not in row_labels:
+                row_labels.append(row_label)
+        return row_labels
+
+    def selected_item_ids(self):
+        # Virtualized rows scrolled out of the window drop out of the Treeview selection, so fall back to the remembered one
+        selected_items = self.job_tree.selection()
+        if not selected_items and self.virtual_list.get():
+            return self.selection_ids
+        return selected_items
 
     def on_job_select(self, event):
         selected_items = self.job_tree.selection()  # Get selected item IDs
         if not selected_items:  # Check if no items are selected
             return
 
+        # Re-selecting rows that scrolled back into a virtualized window isn't a new selection
+        if selected_items == self.restored_selection:
+            self.restored_selection = None
+            return
+        self.selection_ids = selected_items
+
         selected_item = selected_items[0]  # Get the first selected item ID
-        job = self.job_tree.item(selected_item, 'values')  # Get job data
+        row_label = self.row_for_item(selected_item)
+        if row_label is None:
+            return
+        job = self.row_values(row_label)  # Get job data
 
         # Populate Job Details Section
         for i, label in enumerate(self.labels):
@@ -139,11 +606,31 @@ class JobManagementApp:
         self.edit_button.config(state=tk.NORMAL)
         self.save_button.config(state=tk.DISABLED)
         self.delete_button.config(state=tk.NORMAL)
+        self.bulk_edit_button.config(state=tk.NORMAL)
+
+        # Get the job status and update buttons; a multiple selection may hold both
+        self.update_status_buttons(self.df.at[row_label, "Status"])
+        if len(selected_items) > 1:
+            self.mark_done_button.config(state=tk.NORMAL)
+            self.mark_not_done_button.config(state=tk.NORMAL)
+            self.status_bar.config(text=f"Status: {len(selected_items)} jobs selected")
 
-        # Get the job status and update buttons
-        job_number = job[self.labels.index("Job Number")]
-        job_status = self.df[self.df["Job Number"].astype(str).str.strip() == job_number]["Status"].values[0]
-        self.update_status_buttons(job_status)
+        # Archived jobs can be looked at but not changed
+        if len(self.archived_rows) and self.archived_selected(self.selected_rows()):
+            for button in (self.edit_button, self.delete_button, self.bulk_edit_button, self.mark_done_button, self.mark_not_done_button):
+                button.config(state=tk.DISABLED)
+            self.status_bar.config(text="Status: Archived jobs are read-only")
+
+    def archived_selected(self, row_labels):
+        # True if any of the rows came from the archive
+        return bool(len(self.archived_rows)) and bool(np.isin(row_labels, self.archived_rows).any())
+
+    def refuse_archived(self, row_labels):
+        # Guard for actions that change jobs; returns True (after saying why) if any of the rows is archived
+        if self.archived_selected(row_labels):
+            self.status_bar.config(text="Status: Archived jobs are read-only")
+            return True
+        return False
 
     def update_status_buttons(self, status):
         if status == "Done":
@@ -154,33 +641,61 @@ class JobManagementApp:
             self.mark_not_done_button.config(state=tk.DISABLED)
 
     def enable_editing(self):
+        if self.refuse_archived(self.selected_rows()):
+            return
         for label in self.labels:
             self.entries[label].config(state=tk.NORMAL)
         self.save_button.config(state=tk.NORMAL)
         self.edit_button.config(state=tk.DISABLED)
 
+    @timed_action("save job")
     def save_job(self):
-        selected_items = self.job_tree.selection()  # Get selected item IDs
+        selected_items = self.selected_item_ids()  # Get selected item IDs
         if not selected_items:  # Check if no items are selected
             self.status_bar.config(text="Status: No job selected")
             return
 
         selected_item = selected_items[0]  # Get the first selected item ID
-        job_number = self.job_tree.item(selected_item, 'values')[self.labels.index("Job Number")]
+        row_label = self.row_for_item(selected_item)
+        if row_label is None:
+            self.status_bar.config(text="Status: Job not found")
+            return
+        if self.refuse_archived([row_label]):
+            return
+        job_number = self.df.at[row_label, "Job Number"]
 
-        # Update the DataFrame with the new values from the entry widgets
+        # Validate and convert the new values from the entry widgets
         updated_values = {label: self.entries[label].get(1.0, tk.END).strip() if label == "Notes" else self.entries[label].get() for label in self.labels}
-        
-        # Update DataFrame
-        self.df.loc[self.df["Job Number"].astype(str).str.strip() == job_number, updated_values.keys()] = updated_values.values()
-        
-        # Save to Excel
-        self.save_to_excel()
+        try:
+            updated_values = job_model.parse_job_fields(updated_values)
+        except ValueError as error:
+            messagebox.showerror("Invalid Job Details", str(error))
+            return
 
-        self.load_jobs_from_excel("jobs.xlsx")
-        
-        # Update Treeview
-        self.update_treeview()
+        new_job_number = updated_values["Job Number"]
+        if new_job_number and self.find_job_row(new_job_number) not in (None, row_label):
+            messagebox.showerror("Duplicate Job Number", f"Job Number {new_job_number} already exists.")
+            return
+
+        # Update the row in place and recompute its derived column
+        with self.perf.phase("model update"):
+            old_sort_key = job_model.sort_keys(self.df.loc[[row_label]], self.sort_column)[0]
+            updated_values["Days in Shop"] = job_model.days_since(updated_values["Production Date"])
+            job_model.set_job_values(self.df, row_label, updated_values)
+
+            # Re-key the index if the Job Number was edited
+            job_number_changed = str(job_number).strip() != new_job_number
+            if job_number_changed:
+                self.unindex_job(job_number)
+                self.index_job(new_job_number, row_label)
+        search_changed = self.jobs_changed([row_label])
+
+        # Save just this row
+        self.persist_rows([row_label])
+
+        # Update Treeview; only a changed sort position or item ID needs the full diff
+        sort_changed = old_sort_key != job_model.sort_keys(self.df.loc[[row_label]], self.sort_column)[0]
+        self.refresh_job_row(row_label, resort=sort_changed or job_number_changed or search_changed)
 
         # Clear job details after saving
         self.clear_job_details()
@@ -188,72 +703,97 @@ class JobManagementApp:
         # Feedback to the user
         self.status_bar.config(text="Status: Job details updated")
 
+    @timed_action("mark done")
     def mark_done(self):
-        selected_items = self.job_tree.selection()  # Get selected item IDs
-        if not selected_items:  # Check if no items are selected
-            self.status_bar.config(text="Status: No job selected")
-            return
-
-        selected_item = selected_items[0]  # Get the first selected item ID
-        job_number = self.job_tree.item(selected_item, 'values')[self.labels.index("Job Number")]
-
-        # Check the current status
-        current_status = self.df[self.df["Job Number"].astype(str).str.strip() == job_number]["Status"].values[0]
-        if current_status == "Done":
-            self.status_bar.config(text="Status: Job already marked as Done")
-            return
-
-        self.df.loc[self.df["Job Number"].astype(str).str.strip() == job_number, "Status"] = "Done"
-        self.update_status_buttons("Done")
-        self.status_bar.config(text="Status: Job marked as Done")
-
-        # Update Excel and Treeview
-        self.save_to_excel()
-        self.update_treeview()
+        self.set_selected_status("Done")
 
+    @timed_action("mark not done")
     def mark_not_done(self):
-        selected_items = self.job_tree.selection()  # Get selected item IDs
-        if not selected_items:  # Check if no items are selected
+        self.set_selected_status("Not Done")
+
+    def set_selected_status(self, status):
+        # Every selected job at once: one mask over the DataFrame, one save request and one list refresh
+        row_labels = self.selected_rows()
+        if not row_labels:
             self.status_bar.config(text="Status: No job selected")
             return
+        if self.refuse_archived(row_labels):
+            return
 
-        selected_item = selected_items[0]  # Get the first selected item ID
-        job_number = self.job_tree.item(selected_item, 'values')[self.labels.index("Job Number")]
-
-        # Check the current status
-        current_status = self.df[self.df["Job Number"].astype(str).str.strip() == job_number]["Status"].values[0]
-        if current_status == "Not Done":
-            self.status_bar.config(text="Status: Job already marked as Not Done")
+        with self.perf.phase("model update"):
+            changing = self.df.index.isin(row_labels) & (self.df["Status"] != status).to_numpy()
+            changed_labels = self.df.index[changing]
+            if len(changed_labels):
+                job_model.set_jobs_values(self.df, changed_labels, job_model.status_values(status))
+        if not len(changed_labels):
+            self.status_bar.config(text=f"Status: Job already marked as {status}" if len(row_labels) == 1 else f"Status: Selected jobs already marked as {status}")
             return
+        self.jobs_changed(changed_labels)
 
-        self.df.loc[self.df["Job Number"].astype(str).str.strip() == job_number, "Status"] = "Not Done"
-        self.update_status_buttons("Not Done")
-        self.status_bar.config(text="Status: Job marked as Not Done")
+        self.update_status_buttons(status)
+        self.status_bar.config(text=f"Status: Job marked as {status}" if len(changed_labels) == 1 else f"Status: {len(changed_labels)} jobs marked as {status}")
 
         # Update Excel and Treeview
-        self.save_to_excel()
+        self.persist_rows(changed_labels)
         self.update_treeview()
 
     def delete_job(self):
-        selected_items = self.job_tree.selection()  # Get selected item IDs
-        if not selected_items:  # Check if no items are selected
+        row_labels = self.selected_rows()
+        if not row_labels:  # Check if no items are selected
             self.status_bar.config(text="Status: No job selected")
             return
-
-        selected_item = selected_items[0]  # Get the first selected item ID
-        job_number = self.job_tree.item(selected_item, 'values')[self.labels.index("Job Number")]
+        if self.refuse_archived(row_labels):
+            return
+        job_numbers = self.df.loc[row_labels, "Job Number"]
 
         # Confirmation dialog
-        response = messagebox.askyesno("Delete Job", f"Are you sure you want to delete the job with Job Number {job_number}?")
+        if len(row_labels) == 1:
+            response = messagebox.askyesno("Delete Job", f"Are you sure you want to delete the job with Job Number {job_numbers.iloc[0]}?")
+        else:
+            response = messagebox.askyesno("Delete Jobs", f"Are you sure you want to delete {len(row_labels)} jobs?")
         if response:  # If user confirms
-            self.df = self.df[self.df["Job Number"].astype(str).str.strip() != job_number]
-            self.save_to_excel()
-            self.update_treeview()
-            self.clear_job_details()  # Clear job details after deletion
-            self.status_bar.config(text=f"Status: Job {job_number} deleted")
+            with self.perf.action("delete job"):  # Timed from the confirmation on
+                with self.perf.phase("model update"):
+                    self.df = self.df.drop(index=row_labels)
+                    for row_label, job_number in job_numbers.items():
+                        if self.find_job_row(job_number) == row_label:  # A duplicate number may belong to another row
+                            self.unindex_job(job_number)
+                self.jobs_changed(row_labels, deleted=True)
+                self.selection_ids = ()
+                self.persist_deletes(row_labels, job_numbers)
+                self.update_treeview()
+                self.clear_job_details()  # Clear job details after deletion
+            if len(row_labels) == 1:
+                self.status_bar.config(text=f"Status: Job {job_numbers.iloc[0]} deleted")
+            else:
+                self.status_bar.config(text=f"Status: {len(row_labels)} jobs deleted")
         else:  # If user cancels
             self.status_bar.config(text="Status: Deletion canceled")
 
+    def open_bulk_edit_dialog(self):
+        row_labels = self.selected_rows()
+        if not row_labels:
+            self.status_bar.config(text="Status: No job selected")
+            return
+        if self.refuse_archived(row_labels):
+            return
+        bulk_edit_dialog = BulkEditDialog(self, row_labels)
+        self.root.wait_window(bulk_edit_dialog.top)
+
+    @timed_action("edit jobs")
+    def apply_bulk_edit(self, row_labels, column, value):
+        # One field set to the same value on many jobs, saved and redrawn once
+        with self.perf.phase("model update"):
+            values = {column: value}
+            if column == "Production Date":
+                values["Days in Shop"] = job_model.days_since(value)
+            job_model.set_jobs_values(self.df, row_labels, values)
+        self.jobs_changed(row_labels)
+        self.persist_rows(row_labels)
+        self.update_treeview()
+        self.clear_job_details()
+        self.status_bar.config(text=f"Status: {column} updated on {len(row_labels)} jobs")
+
     def clear_job_details(self):
         for label in self.labels:
             if label == "Notes":
@@ -269,119 +809,807 @@ class JobManagementApp:
         self.edit_button.config(state=tk.DISABLED)
         self.save_button.config(state=tk.DISABLED)
         self.delete_button.config(state=tk.DISABLED)
+        self.bulk_edit_button.config(state=tk.DISABLED)
 
+    @timed_phase("save snapshot")
     def save_to_excel(self):
-        self.df.to_excel(self.file_path, index=False)
-
-    def update_treeview(self):
-        def get_gradient_color(days):
-            if days <= 45:
-                red = int((days / 45) * 255)
-                green = 255
-                blue = 0
-                return f'#{red:02x}{green:02x}{blue:02x}'
-            elif (days > 45) and (days <= 90):
-                red = 255
-                green = 255 - int(((days - 45) / 45) * 255)
-                blue = 0
-                return f'#{red:02x}{green:02x}{blue:02x}'
-            elif (days >= 90):
-                return '#ff0000'
-            
-
-        # Clear the Treeview
-        for item in self.job_tree.get_children():
-            self.job_tree.delete(item)
-
-        # Sort DataFrame by 'Status' and then by 'Days in Shop' in ascending order
-        self.df['Status'] = pd.Categorical(self.df['Status'], categories=['Not Done', 'Done'], ordered=True)
-        sorted_df = self.df.sort_values(by=['Status', 'Days in Shop'], ascending=[True, True])
-
-        # Insert updated data and color-code based on status
-        for _, row in sorted_df.iterrows():
-            values = row.tolist()
-            days_in_shop = row['Days in Shop']
-            color = get_gradient_color(days_in_shop)
-            tags = (f'days_{days_in_shop}',)
-            self.job_tree.tag_configure(f'days_{days_in_shop}', background=color)
-            if row['Status'] == 'Done':
-                tags = ('done',)
-            self.job_tree.insert("", tk.END, values=values, tags=tags)
-        
-        # Apply tag configuration to gray out 'Done' jobs
-        self.job_tree.tag_configure('done', foreground='gray')
+        # Queue a full snapshot for the background writer; back-to-back changes are coalesced into one write
+        self.save_worker.request(df=self.working_jobs())
+
+    @timed_phase("save snapshot")
+    def persist_rows(self, row_labels):
+        # Stores that support it get just the changed rows; a workbook has to be rewritten whole
+        self.unsaved_rows.update(row_labels)
+        self.conflict_rows.difference_update(row_labels)  # Edited again, so the conflict has been seen to
+        if not self.store.row_updates:
+            self.save_to_excel()
+            return
+        rows = job_model.to_storage(self.df.loc[list(row_labels)]).to_dict("index")
+        self.save_worker.request(rows=rows)
+
+    @timed_phase("save snapshot")
+    def persist_deletes(self, row_labels, job_numbers):
+        self.unsaved_deletes.update(str(job_number).strip() for job_number in job_numbers)
+        if not self.store.row_updates:
+            self.save_to_excel()
+            return
+        self.save_worker.request(deleted=row_labels)
+
+    def import_jobs(self):
+        file_path = filedialog.askopenfilename(title="Import Jobs", filetypes=[("Excel Workbook", "*.xlsx")])
+        if not file_path:
+            return
+        if not messagebox.askyesno("Import Jobs", f"Replace all jobs with the contents of {file_path}?"):
+            return
+        with self.perf.action("import jobs"):
+            # Read and convert the whole workbook first, so a bad one leaves the current jobs untouched
+            try:
+                with self.perf.phase("disk read"):
+                    raw = pd.read_excel(file_path)
+                with self.perf.phase("model update"):
+                    problems = job_model.job_problems(raw.reindex(columns=storage.STORED_COLUMNS))
+                    if problems:
+                        lines = [f"Row {row_label + 2}: {message}" for row_label, message in problems[:IMPORT_PROBLEMS_SHOWN]]
+                        if len(problems) > IMPORT_PROBLEMS_SHOWN:
+                            lines.append(f"... and {len(problems) - IMPORT_PROBLEMS_SHOWN} more")
+                        raise ValueError(f"{len(problems)} problems; nothing was imported.\n\n" + "\n".join(lines))
+                    jobs = job_model.to_model(raw)
+            except (OSError, ValueError) as error:
+                messagebox.showerror("Import Failed", f"Could not import {file_path}: {error}")
+                self.status_bar.config(text=f"Status: Could not import {file_path}")
+                return
+            self.df = jobs
+            self.rebuild_job_index()
+            self.reset_job_state()
+            self.view_offset = 0
+            self.save_to_excel()
+            self.clear_job_details()
+            self.update_treeview()
+        self.start_search_index()
+        self.perf.sample_memory(self.df)
+        self.status_bar.config(text=f"Status: Imported {len(self.df)} jobs")
+
+    def export_jobs(self):
+        file_path = filedialog.asksaveasfilename(title="Export Jobs", defaultextension=".xlsx", filetypes=[("Excel Workbook", "*.xlsx")])
+        if not file_path:
+            return
+        jobs = self.working_jobs()
+        storage.write_excel_atomic(job_model.to_storage(jobs), file_path)
+        self.status_bar.config(text=f"Status: Exported {len(jobs)} jobs to {file_path}")
+
+    def working_jobs(self):
+        # The job table without any archived rows shown alongside it; this is what gets saved
+        if not len(self.archived_rows):
+            return self.df
+        return self.df.drop(index=self.archived_rows)
+
+    def open_archive_dialog(self):
+        if self.archive_unavailable():
+            return
+        days = simpledialog.askinteger("Archive Done Jobs", "Archive Done jobs produced more than this many days ago:", initialvalue=archive.ARCHIVE_AFTER_DAYS, minvalue=0, parent=self.root)
+        if days is None:
+            return
+        row_labels = self.archivable_rows(days)
+        if not len(row_labels):
+            self.status_bar.config(text=f"Status: No Done jobs older than {days} days")
+            return
+        if messagebox.askyesno("Archive Done Jobs", f"Move {len(row_labels)} Done jobs to {self.archive.directory}?"):
+            self.archive_jobs(row_labels)
+
+    def archive_old_jobs(self, older_than_days):
+        # Non-interactive archiving (e.g. at startup); returns how many jobs were moved
+        if self.archive_unavailable():
+            return 0
+        row_labels = self.archivable_rows(older_than_days)
+        if len(row_labels):
+            self.archive_jobs(row_labels)
+        return len(row_labels)
+
+    def archivable_rows(self, older_than_days):
+        jobs = self.working_jobs()
+        return jobs.index[archive.archivable(jobs, older_than_days)]
+
+    @timed_action("archive jobs")
+    def archive_jobs(self, row_labels):
+        # The archive is written first, so jobs only leave the working store once they're safe in a partition
+        with self.perf.phase("disk write"):
+            try:
+                self.archive.add(self.df.loc[row_labels])
+            except (OSError, ValueError) as error:
+                messagebox.showerror("Archive Failed", f"Could not write to {self.archive.directory}: {error}")
+                return
+
+        with self.perf.phase("model update"):
+            job_numbers = self.df.loc[row_labels, "Job Number"]
+            for row_label, job_number in job_numbers.items():
+                if self.find_job_row(job_number) == row_label:
+                    self.unindex_job(job_number)
+            if self.include_archive.get():
+                # Already showing the archive: the rows stay in view, now as archived ones
+                self.archived_rows = self.archived_rows.append(pd.Index(row_labels, dtype="int64"))
+            else:
+                self.df = self.df.drop(index=row_labels)
+        self.jobs_changed(row_labels, deleted=not self.include_archive.get())
+        self.selection_ids = ()
+        self.persist_deletes(row_labels, job_numbers)
+        self.update_treeview()
+        self.clear_job_details()
+        self.status_bar.config(text=f"Status: Archived {len(row_labels)} jobs to {self.archive.directory}")
+
+    def archive_unavailable(self):
+        # A job server's archive is kept by the station running the server
+        if self.archive is not None:
+            return False
+        self.include_archive.set(False)
+        self.status_bar.config(text="Status: The archive is only available on the job server's station")
+        return True
+
+    def toggle_archive(self):
+        if self.archive_unavailable():
+            return
+        if self.include_archive.get():
+            self.show_archive()
+        else:
+            self.hide_archive()
+
+    @timed_action("show archive")
+    def show_archive(self):
+        # Archive partitions are only read when asked for; their rows join the table read-only, under new labels
+        with self.perf.phase("disk read"):
+            try:
+                archived = self.archive.load()
+            except (OSError, ValueError) as error:
+                self.include_archive.set(False)
+                messagebox.showerror("Archive Error", f"Could not read {self.archive.directory}: {error}")
+                return
+        if archived is None:
+            self.include_archive.set(False)
+            self.status_bar.config(text="Status: No archived jobs")
+            return
+
+        with self.perf.phase("model update"):
+            # Negative labels can't collide with those of jobs added later, here or on another station
+            archived.index = pd.RangeIndex(-len(archived), 0)
+            self.df = job_model.append_jobs(self.df, archived)
+            self.archived_rows = archived.index
+        self.sort_orders.clear()
+        self.update_treeview()
+        self.start_search_index()
+        self.perf.sample_memory(self.df)
+        self.status_bar.config(text=f"Status: Showing {len(archived)} archived jobs (read-only)")
+
+    @timed_action("hide archive")
+    def hide_archive(self):
+        row_labels = self.archived_rows
+        if not len(row_labels):
+            return
+        with self.perf.phase("model update"):
+            self.df = self.df.drop(index=row_labels)
+            self.archived_rows = pd.Index([], dtype="int64")
+        self.jobs_changed(row_labels, deleted=True)
+        self.selection_ids = ()
+        self.update_treeview()
+        self.clear_job_details()
+        self.perf.sample_memory(self.df)
+        self.status_bar.config(text=f"Status: Showing all {len(self.df)} jobs")
+
+    def poll_save_worker(self):
+        self.show_save_messages()
+        self.root.after(SAVE_POLL_MS, self.poll_save_worker)
+
+    def show_save_messages(self):
+        for state, detail in self.save_worker.drain():
+            if state == "pending":
+                self.save_status.config(text="Unsaved changes")
+            elif state == "saving":
+                self.save_status.config(text="Saving...")
+            elif state in ("written", "saved"):
+                self.perf.record("disk write", detail, {"disk write": detail})  # detail is the write's duration
+                self.saved_while_reading = self.reading_file_changes
+                if state == "saved" and not self.save_worker.has_pending():
+                    self.save_status.config(text="All changes saved")
+                    self.unsaved_rows.clear()
+                    self.unsaved_deletes.clear()
+            elif state == "error" and isinstance(detail, storage.FileChangedError):
+                # Saved elsewhere first: poll_file_changes merges that version, then saves again
+                self.save_status.config(text="Unsaved changes")
+                self.status_bar.config(text=f"Status: {self.file_path} was changed elsewhere; merging before saving")
+            elif state == "error":
+                # The worker keeps the changes and tries again
+                self.save_status.config(text="Save failed")
+                self.status_bar.config(text=f"Status: Could not save {self.file_path}: {detail}; retrying")
+
+    def poll_remote_changes(self):
+        self.root.after(REMOTE_POLL_MS, self.poll_remote_changes)
+        if self.remote_reload is not None:
+            (stored, error), self.remote_reload = self.remote_reload, None
+            self.reloading_remote = False
+            self.set_loading(False)
+            if error is not None:
+                self.status_bar.config(text=f"Status: Could not reload the jobs from {self.file_path}: {error}")
+            else:
+                self.load_jobs_from_excel(self.file_path, stored)
+                self.status_bar.config(text=f"Status: Jobs reloaded from {self.file_path}")
+        elif self.reloading_remote:
+            return  # Changes pushed meanwhile wait for the reloaded table; applying them again is harmless
+        for change in self.store.drain_changes():
+            self.apply_remote_change(change)
+
+    @timed_action("remote change")
+    def apply_remote_change(self, change):
+        # Another station's save, pushed by the job server (see job_server.py)
+        if change.get("reload"):
+            if not self.reloading_remote:
+                # The whole table, read on a thread so the window doesn't wait on the network
+                self.reloading_remote = True
+                self.set_loading(True)
+                self.status_bar.config(text=f"Status: Reloading the jobs from {self.file_path}...")
+                threading.Thread(target=self.read_remote_jobs, name="job-reloader", daemon=True).start()
+            return
+        rows = {int(row_label): values for row_label, values in change.get("rows", {}).items()}
+        deleted = [row_label for row_label in change.get("deleted", ()) if row_label in self.df.index]
+        if not rows and not deleted:
+            return
+        self.merge_rows(rows, deleted)
+        self.update_treeview()
+        self.status_bar.config(text=f"Status: {len(rows) + len(deleted)} jobs changed on another station")
+
+    def read_remote_jobs(self):
+        try:
+            self.remote_reload = (self.store.load(), None)
+        except Exception as error:
+            self.remote_reload = (None, error)
+
+    def poll_file_changes(self):
+        self.root.after(WATCH_POLL_MS, self.poll_file_changes)
+        if self.file_changes is not None:
+            (changes, error), self.file_changes = self.file_changes, None
+            self.reading_file_changes = False
+            if error is not None:
+                self.status_bar.config(text=f"Status: Could not read the changes to {self.file_path}: {error}")
+            else:
+                self.merge_file_changes(changes)
+            return
+
+        # Our own saves move the stamp too, so wait until they're done; a save held back by a
+        # FileChangedError waits for this merge
+        if self.reading_file_changes or (self.save_worker.has_pending() and not self.save_worker.is_held()):
+            return
+        try:
+            changed = self.store.file_stamp() != self.store.stamp
+        except OSError:
+            return  # Being replaced right now; look again next time
+        if changed:
+            self.reading_file_changes = True
+            self.saved_while_reading = False
+            self.status_bar.config(text=f"Status: {self.file_path} was changed elsewhere; reading the changes...")
+            threading.Thread(target=self.read_file_changes, args=(self.working_jobs().copy(),), name="file-watcher", daemon=True).start()
+
+    def read_file_changes(self, local):
+        # Watcher thread: the file's new version (which the store now counts as read), diffed against a copy of the table
+        try:
+            self.file_changes = (job_model.diff_jobs(local, job_model.to_model(self.store.load())), None)
+        except Exception as error:
+            self.file_changes = (None, error)
+
+    @timed_action("merge file changes")
+    def merge_file_changes(self, changes):
+        # Rows changed elsewhere replace ours unless ours have unsaved edits; those are kept and flagged as conflicts
+        if changes is None:
+            # Blank or duplicate Job Numbers: rows can't be matched up, so it's all one version or the other
+            if self.unsaved_rows or self.unsaved_deletes:
+                self.save_to_excel()
+                self.status_bar.config(text=f"Status: {self.file_path} was changed elsewhere but can't be merged (blank or duplicate Job Numbers); kept this station's jobs")
+            else:
+                self.load_jobs_from_excel(self.file_path)
+                self.status_bar.config(text=f"Status: Reloaded {self.file_path}, which was changed elsewhere")
+            return
+
+        changed, added, removed = changes
+        rows = {}
+        conflicts = []
+        for row_label, values in changed.items():
+            if row_label in self.unsaved_rows:
+                conflicts.append(row_label)
+            elif row_label in self.df.index:
+                rows[row_label] = values
+        deleted = []
+        for row_label in removed:
+            if row_label in self.unsaved_rows:
+                conflicts.append(row_label)
+            elif row_label in self.df.index:
+                deleted.append(row_label)
+        next_label = self.next_row_label()
+        for values in added:
+            job_number = values["Job Number"].strip()
+            if job_number in self.unsaved_deletes:
+                continue  # Deleted here; the next save deletes it there too
+            local_row = self.find_job_row(job_number)
+            if local_row is not None:
+                conflicts.append(local_row)  # Added here too, under the same number
+                continue
+            rows[next_label] = values
+            next_label += 1
+
+        self.conflict_rows.update(conflicts)
+        self.forget_rows(conflicts)  # Redrawn with the conflict tag
+        if rows or deleted:
+            self.merge_rows(rows, deleted)
+        self.update_treeview()
+
+        # Unsaved edits (and any save that raced the read) go back out on top of the merged version
+        if self.unsaved_rows or self.unsaved_deletes or self.saved_while_reading or self.save_worker.has_pending():
+            self.save_to_excel()
+        message = f"Status: Merged {len(rows) + len(deleted)} changed jobs from {self.file_path}"
+        if conflicts:
+            message += f"; {len(conflicts)} also edited here kept this station's version (shown in red)"
+        self.status_bar.config(text=message)
+
+    def merge_rows(self, rows, deleted):
+        # Applies changes made elsewhere (stored-form rows by label, deleted labels) to the table and its indexes;
+        # they're already saved, so nothing is persisted
+        with self.perf.phase("model update"):
+            # Job Numbers may have changed, so the index entries of every touched row are redone
+            touched = [row_label for row_label in (*deleted, *rows) if row_label in self.df.index]
+            for row_label, job_number in self.df.loc[touched, "Job Number"].items():
+                if self.find_job_row(job_number) == row_label:
+                    self.unindex_job(job_number)
+            if deleted:
+                self.df = self.df.drop(index=deleted)
+            self.df = job_model.upsert_stored_rows(self.df, rows)
+            for row_label, job_number in self.df.loc[list(rows), "Job Number"].items():
+                self.index_job(job_number, row_label)
+        if deleted:
+            self.jobs_changed(deleted, deleted=True)
+        if rows:
+            self.jobs_changed(list(rows))
+
+    def open_performance_window(self):
+        if self.performance_window is not None and self.performance_window.top.winfo_exists():
+            self.performance_window.top.lift()
+            return
+        self.performance_window = PerformanceWindow(self)
+
+    def open_dashboard_window(self):
+        if self.dashboard_window is not None and self.dashboard_window.top.winfo_exists():
+            self.dashboard_window.top.lift()
+            return
+        self.dashboard_window = DashboardWindow(self)
+
+    def toggle_performance(self):
+        self.perf.enabled = self.perf_enabled.get()
+        if self.perf.enabled:
+            self.perf.sample_memory(self.df)
+            self.perf_export_id = self.root.after(PERF_EXPORT_MS, self.export_performance_stats)
+        elif self.perf_export_id is not None:
+            self.root.after_cancel(self.perf_export_id)
+            self.perf_export_id = None
+
+    def export_performance_stats(self, reschedule=True):
+        # Rolling stats on disk, so a slow station can send them in without anyone reproducing the problem
+        try:
+            self.perf.export(PERF_STATS_FILE)
+        except OSError as error:
+            self.status_bar.config(text=f"Status: Could not write {PERF_STATS_FILE}: {error}")
+        self.perf_export_id = self.root.after(PERF_EXPORT_MS, self.export_performance_stats) if reschedule and self.perf.enabled else None
+
+    def on_exit(self):
+        # Flush-on-exit hook: the only place the UI waits for the disk
+        self.save_status.config(text="Saving...")
+        self.root.update_idletasks()
+        if self.save_worker is not None:
+            if not self.flush_on_exit() and not self.resolve_failed_save():
+                return  # Stay open; the worker keeps retrying
+            self.save_worker.stop(flush=False)
+        if self.perf.enabled:
+            self.export_performance_stats(reschedule=False)
+        self.root.quit()
+
+    def flush_on_exit(self):
+        saved = self.save_worker.flush()
+        self.show_save_messages()
+        if not saved and isinstance(self.save_worker.error, storage.FileChangedError):
+            saved = self.merge_before_exit()
+        return saved
+
+    def merge_before_exit(self):
+        # The file was saved elsewhere and the watcher won't get another turn: merge that version here, as
+        # poll_file_changes would, and save the merged table
+        self.status_bar.config(text=f"Status: {self.file_path} was changed elsewhere; merging before quitting...")
+        self.root.update_idletasks()
+        try:
+            changes = job_model.diff_jobs(self.working_jobs().copy(), job_model.to_model(self.store.load()))
+        except Exception as error:
+            self.status_bar.config(text=f"Status: Could not read the changes to {self.file_path}: {error}")
+            return False
+        conflicts = len(self.conflict_rows)
+        self.merge_file_changes(changes)
+        saved = self.save_worker.flush()
+        self.show_save_messages()
+        if saved and len(self.conflict_rows) > conflicts:
+            messagebox.showinfo("Changes Merged", f"{self.file_path} was changed elsewhere while you worked. The changes were merged; {len(self.conflict_rows) - conflicts} jobs edited in both places kept this station's version.")
+        return saved
+
+    def resolve_failed_save(self):
+        # The last write before quitting failed. True once the user has the changes saved somewhere or chose
+        # to drop them; False to keep the app open.
+        while True:
+            dialog = SaveFailedDialog(self, self.save_worker.error)
+            self.root.wait_window(dialog.top)
+            if dialog.choice == "retry":
+                self.save_status.config(text="Saving...")
+                self.root.update_idletasks()
+                if self.flush_on_exit():
+                    return True
+            elif dialog.choice == "save copy":
+                file_path = filedialog.asksaveasfilename(title="Save Jobs Elsewhere", defaultextension=".xlsx", filetypes=[("Excel Workbook", "*.xlsx")])
+                if not file_path:
+                    continue
+                try:
+                    storage.write_excel_atomic(job_model.to_storage(self.working_jobs()), file_path)
+                    return True
+                except OSError as error:
+                    messagebox.showerror("Save Failed", f"Could not write {file_path}: {error}")
+            elif dialog.choice == "quit":
+                return True
+            else:
+                return False
+
+    @timed_phase("list refresh")
+    def update_treeview(self, full=False):
+        # Rows in the current sort order, taken from the cache (Not Done first, then by 'Days in Shop', by default)
+        with self.perf.phase("sort"):
+            self.sorted_order = self.sort_orders.order(self.df, self.sort_column, self.sort_descending)
+        self.display_order = self.filtered_order()
+
+        self.render_job_rows(full)
+
+    def filtered_order(self):
+        # The sorted job order, narrowed to the search matches while a search is active
+        if self.search_matches is None:
+            return self.sorted_order
+        return self.sorted_order[np.isin(self.sorted_order, self.search_matches)]
+
+    @timed_action("sort")
+    def sort_by(self, column):
+        # Heading clicks cycle ascending, descending, then back to the default order
+        if self.df is None:
+            return
+        if self.sort_column != column:
+            self.sort_column, self.sort_descending = column, False
+        elif not self.sort_descending:
+            self.sort_descending = True
+        else:
+            self.sort_column, self.sort_descending = None, False
+        for col in self.columns:
+            arrow = (" \u25bc" if self.sort_descending else " \u25b2") if col == self.sort_column else ""
+            self.job_tree.heading(col, text=col + arrow)
+        self.view_offset = 0
+        self.update_treeview()
+
+    def on_search_changed(self, *args):
+        # Wait for a pause in typing so a burst of keystrokes costs one refresh
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DELAY_MS, self.apply_search)
+
+    @timed_action("search")
+    def apply_search(self):
+        self.search_after_id = None
+        query = self.search_text.get().strip()
+        if not self.search_index.ready:
+            if query:
+                self.status_bar.config(text="Status: Indexing jobs for search...")
+            return  # poll_search_index runs the search when the index is ready
+
+        with self.perf.phase("lookup"):
+            self.search_matches = self.search_index.search(query)
+            self.display_order = self.filtered_order()
+        self.view_offset = 0
+        self.render_job_rows()
+        if self.search_matches is None:
+            self.status_bar.config(text=f"Status: Showing all {len(self.df)} jobs")
+        else:
+            self.status_bar.config(text=f"Status: {len(self.display_order)} of {len(self.df)} jobs match \"{query}\"")
+
+    def poll_search_index(self):
+        self.search_poll_id = None
+        error = self.search_index.install_build()
+        if not self.search_index.ready:
+            self.search_poll_id = self.root.after(SEARCH_POLL_MS, self.poll_search_index)
+            return
+        if error is not None:
+            self.status_bar.config(text=f"Status: Search index failed: {error}")
+        elif self.search_text.get().strip():
+            self.apply_search()
+
+    @timed_phase("list refresh")
+    def render_job_rows(self, full=False):
+        # Materialize every row, or only the visible window plus a buffer when the list is virtualized
+        self.stop_populating()
+        start, end = self.visible_window()
+        dirty, self.dirty_rows = self.dirty_rows, set()
+        if not full and not self.virtual_list.get() and self.patch_job_rows(dirty):
+            return
+        window_labels = self.display_order[start:end].tolist()
+
+        if full:
+            # Clear the Treeview and forget what was shown
+            self.job_tree.delete(*self.job_tree.get_children())
+            self.tree_rows = {}
+            self.tree_order = []
+            self.row_items = {}
+
+        # Rows already shown and unchanged since keep their display strings; only the others are formatted
+        missing = [row_label for row_label in window_labels if row_label not in self.row_items]
+        formatted = dict(zip(missing, self.format_job_rows(missing)))
+
+        # Work out what every row should look like, in display order
+        desired = []
+        for row_label in window_labels:
+            entry = formatted.get(row_label)
+            if entry is None:
+                item_id = self.row_items[row_label]
+                entry = (item_id, *self.tree_rows[item_id])
+            desired.append(entry)
+
+        # Drop items for rows that are gone
+        wanted = {item_id for item_id, _, _ in desired}
+        stale = [item_id for item_id in self.tree_order if item_id not in wanted]
+        if stale:
+            self.job_tree.delete(*stale)
+            for item_id in stale:
+                del self.tree_rows[item_id]
+            self.tree_order = [item_id for item_id in self.tree_order if item_id in wanted]
+
+        # Items already in the right relative order stay put; everything else gets placed after its predecessor
+        current_position = {item_id: i for i, item_id in enumerate(self.tree_order)}
+        existing = [(i, current_position[item_id]) for i, (item_id, _, _) in enumerate(desired) if item_id in current_position]
+        stable = {existing[k][0] for k in longest_increasing_subsequence([position for _, position in existing])}
+
+        if len(existing) - len(stable) > REORDER_MOVE_LIMIT:
+            # New items go in at the front, where inserting is cheap, then one call puts everything in order
+            for item_id, values, tags in desired:
+                shown = self.tree_rows.get(item_id)
+                if shown is None:
+                    self.job_tree.insert("", 0, iid=item_id, values=values, tags=tags)
+                elif shown != (values, tags):
+                    self.job_tree.item(item_id, values=values, tags=tags)
+                self.tree_rows[item_id] = (values, tags)
+            self.job_tree.set_children("", *[item_id for item_id, _, _ in desired])
+        else:
+            next_index = 0  # Position after the last placed item, or None if it has to be asked for
+            for i, (item_id, values, tags) in enumerate(desired):
+                shown = self.tree_rows.get(item_id)
+                if i in stable:
+                    next_index = None
+                else:
+                    if shown is None:
+                        if next_index is None:
+                            next_index = self.job_tree.index(desired[i - 1][0]) + 1
+                        self.job_tree.insert("", next_index, iid=item_id, values=values, tags=tags)
+                    else:
+                        # Detach first so the target index doesn't depend on where the item used to be
+                        self.job_tree.detach(item_id)
+                        next_index = self.job_tree.index(desired[i - 1][0]) + 1 if i else 0
+                        self.job_tree.move(item_id, "", next_index)
+                    next_index += 1
+                if shown is not None and shown != (values, tags):
+                    self.job_tree.item(item_id, values=values, tags=tags)
+                self.tree_rows[item_id] = (values, tags)
+
+        self.tree_order = [item_id for item_id, _, _ in desired]
+        self.row_items = {row_label: item_id for row_label, (item_id, _, _) in zip(window_labels, desired)}
+        self.tree_labels = self.display_order[start:end].copy()
+        self.window_start = start
+
+        if self.virtual_list.get():
+            # Scroll the window so the first visible row sits at the top, and restore any selection paged back in
+            self.job_tree.yview_moveto((self.view_offset - start) / max(1, end - start))
+            selection = tuple(item_id for item_id in self.selection_ids if item_id in self.tree_rows)
+            if selection and selection != self.job_tree.selection():
+                self.restored_selection = selection
+                self.job_tree.selection_set(selection)
+            self.update_scrollbar()
+
+    def patch_job_rows(self, dirty):
+        # Refresh of a fully materialized list after an edit: if every other row kept its place, only the dirty
+        # rows are taken out and put back at their new positions, so the cost follows the rows changed rather than
+        # the rows shown. False (with nothing touched) when the order changed otherwise, e.g. a new sort or search;
+        # the full diff handles that.
+        shown = self.tree_labels
+        if shown is None or len(shown) != len(self.tree_order) or len(dirty) > REORDER_MOVE_LIMIT:
+            return False
+        order = self.display_order
+        dirty_labels = np.fromiter(dirty, dtype="int64", count=len(dirty))
+        shown_dirty = np.isin(shown, dirty_labels)
+        order_dirty = np.isin(order, dirty_labels)
+        if not np.array_equal(shown[~shown_dirty], order[~order_dirty]):
+            return False
+
+        old_positions = np.flatnonzero(shown_dirty).tolist()
+        old_items = [self.tree_order[position] for position in old_positions]
+        new_positions = np.flatnonzero(order_dirty).tolist()
+        labels = order[new_positions].tolist()
+        rows = self.format_job_rows(labels)
+        if any(item_id in self.tree_rows and item_id not in old_items for item_id, _, _ in rows):
+            return False  # A redrawn row would take over another row's item ID
+
+        # Take the old items out, then put each row back in ascending position, so every index is final
+        for position in reversed(old_positions):
+            del self.tree_order[position]
+        if old_items:
+            self.job_tree.detach(*old_items)
+        for position, row_label, (item_id, values, tags) in zip(new_positions, labels, rows):
+            shown_row = self.tree_rows.get(item_id)
+            if shown_row is None:
+                self.job_tree.insert("", position, iid=item_id, values=values, tags=tags)
+            else:
+                self.job_tree.move(item_id, "", position)
+                if shown_row != (values, tags):
+                    self.job_tree.item(item_id, values=values, tags=tags)
+            self.tree_rows[item_id] = (values, tags)
+            self.tree_order.insert(position, item_id)
+            self.row_items[row_label] = item_id
+        kept = {item_id for item_id, _, _ in rows}
+        gone = [item_id for item_id in old_items if item_id not in kept]
+        if gone:
+            self.job_tree.delete(*gone)
+            for item_id in gone:
+                del self.tree_rows[item_id]
+        self.tree_labels = order.copy()
+        self.window_start = 0
+        return True
+
+    def format_job_rows(self, row_labels):
+        # (item ID, display strings, tags) for each row, formatted in one vectorized pass
+        if not row_labels:
+            return []
+        jobs = self.df.loc[row_labels]
+        rows = []
+        for row_label, row, status, bucket in zip(row_labels, job_model.format_rows(jobs).itertuples(index=False), jobs["Status"], job_model.aging_buckets(jobs["Days in Shop"])):
+            values = tuple(row)
+            rows.append((self.tree_item_id(row_label, values), values, self.row_tags(row_label, status, bucket)))
+        return rows
+
+    def row_tags(self, row_label, status, bucket):
+        tags = ('done',) if status == 'Done' else (f'aging_{bucket}',)
+        if row_label in self.conflict_rows:
+            tags += ('conflict',)
+        return tags
+
+    @timed_phase("list refresh")
+    def refresh_job_row(self, row_label, resort=False):
+        # Rewrite one job's item in place; if its position or item ID may have changed, run the full diff
+        if resort:
+            self.update_treeview()
+            return
+        values = self.row_values(row_label)
+        item_id = self.tree_item_id(row_label, values)
+        if item_id not in self.tree_rows:
+            return  # Outside the virtualized window; it picks up the new values when paged in
+        tags = self.row_tags(row_label, self.df.at[row_label, "Status"], aging_bucket(self.df.at[row_label, "Days in Shop"]))
+        if self.tree_rows[item_id] != (values, tags):
+            self.job_tree.item(item_id, values=values, tags=tags)
+            self.tree_rows[item_id] = (values, tags)
+
+    def visible_row_count(self):
+        height = self.job_tree.winfo_height()
+        if height <= 1:  # Not mapped yet
+            return int(self.job_tree.cget("height"))
+        return max(1, height // self.row_height)
+
+    def visible_window(self):
+        total = len(self.display_order)
+        if not self.virtual_list.get():
+            return 0, total
+        visible = self.visible_row_count()
+        self.view_offset = max(0, min(self.view_offset, total - visible))
+        start = max(0, self.view_offset - VIRTUAL_LIST_BUFFER)
+        end = min(total, self.view_offset + visible + VIRTUAL_LIST_BUFFER)
+        return start, end
+
+    def update_scrollbar(self):
+        total = len(self.display_order)
+        if not total:
+            self.job_scrollbar.set(0, 1)
+            return
+        self.job_scrollbar.set(self.view_offset / total, min(1, (self.view_offset + self.visible_row_count()) / total))
+
+    def on_tree_scroll(self, first, last):
+        if not self.virtual_list.get():
+            self.job_scrollbar.set(first, last)
+            return
+
+        # The Treeview scrolled inside its window (wheel, keyboard); track the new top row
+        window_length = len(self.tree_order)
+        top = self.window_start + round(float(first) * window_length)
+        if top != self.view_offset:
+            self.view_offset = top
+            # Page in a new window once the view gets close to either edge of the materialized rows
+            margin = VIRTUAL_LIST_BUFFER // 2
+            near_top = self.window_start > 0 and top - self.window_start < margin
+            near_bottom = self.window_start + window_length < len(self.display_order) and self.window_start + window_length - (top + self.visible_row_count()) < margin
+            if near_top or near_bottom:
+                with self.perf.action("scroll"):
+                    self.render_job_rows()
+                return
+        self.update_scrollbar()
+
+    @timed_action("scroll")
+    def on_scrollbar(self, *args):
+        if not self.virtual_list.get():
+            self.job_tree.yview(*args)
+            return
+
+        # The scrollbar spans every row, not just the materialized window
+        if args[0] == "moveto":
+            self.view_offset = int(float(args[1]) * len(self.display_order))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.view_offset += step * self.visible_row_count() if args[2] == "pages" else step
+        self.render_job_rows()
+
+    def on_tree_resize(self, event):
+        if self.virtual_list.get():
+            self.render_job_rows()
+
+    @timed_action("toggle virtual list")
+    def toggle_virtual_list(self):
+        self.view_offset = 0
+        self.render_job_rows(full=True)
+        if not self.virtual_list.get():
+            self.job_tree.yview_moveto(0)
+
+    def tree_item_id(self, row_label, values):
+        # Items are keyed by Job Number so they survive reloads; blank or duplicate numbers fall back to the row
+        job_number = values[self.columns.index("Job Number")].strip()
+        if job_number and self.job_index.get(job_number) == row_label:
+            return f"job:{job_number}"
+        return f"row:{row_label}"
 
     def open_add_job_dialog(self):
         add_job_dialog = AddJobDialog(self)
         self.root.wait_window(add_job_dialog.top)
 
     def print_pdf(self):
-        # Create a PDF with landscape orientation and setup
-        pdf_file = "Undone_Jobs_Report.pdf"
-        doc = SimpleDocTemplate(pdf_file, pagesize=landscape(letter))
-
-        # Define styles for the table
-        styles = getSampleStyleSheet()
-        normal_style = styles["Normal"]
-
-        # Table data: column headers
-        data = [["Job Number", "Name", "Phone Number", "Location", "Sign Off Date", "Production Date", "Notes", "Days in Shop"]]
-
-        sorted_df = self.df[self.df["Status"] == "Not Done"].sort_values(by="Days in Shop")
-
-
-        # Add each job's details to the table with text wrapping
-        for _, row in sorted_df.iterrows():
-            job_details = [
-                Paragraph(str(row["Job Number"]), normal_style),
-                Paragraph(str(row["Name"]), normal_style),
-                Paragraph(str(row["Phone Number"]), normal_style),
-                Paragraph(str(row["Location"]), normal_style),
-                Paragraph(str(row["Sign Off Date"]), normal_style),
-                Paragraph(str(row["Production Date"]), normal_style),
-                Paragraph(str(row["Notes"]), normal_style),
-                Paragraph(str(row["Days in Shop"]), normal_style)
-            ]
-            data.append(job_details)
-
-        # Create the table
-        table = Table(data, colWidths=[60, 110, 80, 90, 80, 80, 200, 60])  # Adjust column widths as necessary
-
-        # Style the table
-        style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),  # Header background color
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),  # Header text color
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),  # Center alignment
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # Top align for wrapping content
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),  # Grid lines
-            ('FONTSIZE', (0, 0), (-1, -1), 10),  # Font size for all cells
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),  # Row background color
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),  # Normal text color
-        ])
-
-        # Apply the gradient for "Days in Shop" based on the values
-        for i in range(1, len(data)):
-            days_in_shop = int(sorted_df.iloc[i - 1]["Days in Shop"])
-
-            if days_in_shop <= 30:
-                bg_color = colors.green
-            elif (days_in_shop > 30) and (days_in_shop <= 70):
-                bg_color = colors.yellow
-            elif (days_in_shop >= 70):
-                bg_color = colors.red
-
-            style.add('BACKGROUND', (7, i), (7, i), bg_color)
-        
-        table.setStyle(style)
-
-        # Allow the table to split across multiple pages
-        elements = [table]
+        # The report is built on a worker thread from a snapshot of the undone jobs. ReportLab is only imported
+        # the first time a report is asked for.
+        from pdf_report import ReportJob, undone_jobs
 
-        # Build the document (multi-page support)
-        doc.build(elements)
-
-        # Notify user that PDF generation is complete
-        messagebox.showinfo("Success", "PDF generated successfully!")
+        if self.report_job is not None:
+            self.status_bar.config(text="Status: A PDF report is already being generated")
+            return
+        self.report_started = time.perf_counter()
+        self.report_job = ReportJob(undone_jobs(self.df).copy(), "Undone_Jobs_Report.pdf")
+        self.cancel_report_button.pack(side=tk.RIGHT)
+        self.status_bar.config(text="Status: Generating PDF...")
+        self.root.after(REPORT_POLL_MS, self.poll_report_job)
+
+    def cancel_pdf(self):
+        if self.report_job is not None:
+            self.report_job.cancel()
+            self.status_bar.config(text="Status: Canceling PDF...")
+
+    def poll_report_job(self):
+        for state, detail in self.report_job.drain():
+            if state == "progress":
+                self.status_bar.config(text=f"Status: Generating PDF - {detail}")
+                continue
+            report_job, self.report_job = self.report_job, None
+            self.cancel_report_button.pack_forget()
+            if state == "done":
+                self.perf.record("print pdf", time.perf_counter() - self.report_started, {"pdf build": report_job.build_seconds})
+                self.status_bar.config(text=f"Status: PDF saved to {detail}")
+                # Notify user that PDF generation is complete
+                messagebox.showinfo("Success", "PDF generated successfully!")
+            elif state == "cancelled":
+                self.status_bar.config(text="Status: PDF generation canceled")
+            else:
+                self.status_bar.config(text="Status: PDF generation failed")
+                messagebox.showerror("PDF Error", f"Could not generate the PDF: {detail}")
+            return
+        self.root.after(REPORT_POLL_MS, self.poll_report_job)
 
 class AddJobDialog:
     def __init__(self, parent):
@@ -464,41 +1692,261 @@ class AddJobDialog:
             "Status": "Not Done"
         }
 
-        if not new_job["Notes"]:
-            new_job["Notes"] = ""  # Set to empty string instead of NaN
-        if not new_job["Job Number"]:
-            new_job["Job Number"] = ""  # Set to empty string instead of NaN
+        # Untouched placeholder text isn't data
+        placeholders = [placeholder for _, placeholder in self.labels]
+        for label, value in new_job.items():
+            if value in placeholders:
+                new_job[label] = ""
 
-        # Validate the dates
+        # Validate the dates and price
         try:
-            sign_off_date = pd.to_datetime(new_job["Sign Off Date"], format="%Y-%m-%d")
-            production_date = pd.to_datetime(new_job["Production Date"], format="%Y-%m-%d")
-            new_job["Sign Off Date"] = sign_off_date.strftime("%Y-%m-%d")
-            new_job["Production Date"] = production_date.strftime("%Y-%m-%d")
-        except ValueError:
-            messagebox.showerror("Invalid Date Format", "Dates must be in YYYY-MM-DD format.")
+            new_job = job_model.parse_job_fields(new_job)
+        except ValueError as error:
+            messagebox.showerror("Invalid Job Details", str(error))
             return
 
-        # Calculate Days in Shop
-        days_in_shop = (pd.Timestamp.now() - production_date).days
-        new_job["Days in Shop"] = days_in_shop
+        # Job Numbers are the lookup key, so refuse duplicates
+        if new_job["Job Number"] and self.parent.find_job_row(new_job["Job Number"]) is not None:
+            messagebox.showerror("Duplicate Job Number", f"Job Number {new_job['Job Number']} already exists.")
+            return
 
-        # Convert new job to DataFrame
-        new_job_df = pd.DataFrame([new_job])
+        # From a job server the label can fail to arrive; nothing has changed yet, so the dialog just stays open
+        try:
+            row_label = self.parent.next_row_label()
+        except OSError as error:
+            messagebox.showerror("Add Job Failed", f"Could not add the job: {error}")
+            return
+
+        perf = self.parent.perf
+        with perf.action("add job"):
+            # Convert new job to a typed row (Days in Shop included), keeping row labels stable for the job index
+            with perf.phase("model update"):
+                new_job_df = job_model.new_job_frame(new_job, row_label)
+
+                # Concatenate the new job to the DataFrame
+                self.parent.df = job_model.append_jobs(self.parent.df, new_job_df)
+                self.parent.index_job(new_job["Job Number"], row_label)
+            self.parent.jobs_changed([row_label])
+
+            # Save and update Treeview
+            self.parent.persist_rows([row_label])
+            self.parent.update_treeview()
+
+        self.top.destroy()
+
+class BulkEditDialog:
+    # Sets one field to the same value on every selected job; Job Number is left out since it must stay unique
+    FIELDS = ["Sign Off Date", "Name", "Phone Number", "Location", "Production Date", "Price", "Notes"]
+
+    def __init__(self, parent, row_labels):
+        top = self.top = tk.Toplevel(parent.root)
+        self.parent = parent
+        self.row_labels = row_labels
+        self.top.title(f"Edit {len(row_labels)} Selected Jobs")
+
+        field_frame = tk.Frame(self.top)
+        field_frame.pack(fill=tk.X, padx=5, pady=2)
+        field_label = tk.Label(field_frame, text="Field", width=15)
+        field_label.pack(side=tk.LEFT, padx=5)
+        self.field = ttk.Combobox(field_frame, values=self.FIELDS, state="readonly")
+        self.field.set("Location")
+        self.field.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+        value_frame = tk.Frame(self.top)
+        value_frame.pack(fill=tk.X, padx=5, pady=2)
+        value_label = tk.Label(value_frame, text="New Value", width=15)
+        value_label.pack(side=tk.LEFT, padx=5)
+        self.value_entry = tk.Entry(value_frame)
+        self.value_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+        button_frame = tk.Frame(self.top)
+        button_frame.pack(fill=tk.X, padx=5, pady=5)
+        apply_button = tk.Button(button_frame, text="Apply", command=self.apply)
+        apply_button.pack(side=tk.LEFT, padx=5)
+        cancel_button = tk.Button(button_frame, text="Cancel", command=self.top.destroy)
+        cancel_button.pack(side=tk.LEFT, padx=5)
+
+    def apply(self):
+        column = self.field.get()
+        try:
+            value = job_model.parse_job_fields({column: self.value_entry.get()})[column]
+        except ValueError as error:
+            messagebox.showerror("Invalid Value", str(error), parent=self.top)
+            return
+        self.parent.apply_bulk_edit(self.row_labels, column, value)
+        self.top.destroy()
 
-        # Concatenate the new job to the DataFrame
-        self.parent.df = pd.concat([self.parent.df, new_job_df], ignore_index=True)
 
-        # Save to Excel and update Treeview
-        self.parent.save_to_excel()
-        self.parent.update_treeview()
+class SaveFailedDialog:
+    # Asked on exit when the changes couldn't be written; `choice` is "retry", "save copy", "quit" or None if closed
+    def __init__(self, parent, error):
+        top = self.top = tk.Toplevel(parent.root)
+        self.choice = None
+        self.top.title("Save Failed")
+        self.top.transient(parent.root)
+        self.top.grab_set()
 
+        message = tk.Label(self.top, text=f"Could not save {parent.file_path}:\n{error}\n\nYour latest changes are not saved yet.", justify=tk.LEFT, wraplength=400)
+        message.pack(padx=10, pady=10)
+
+        button_frame = tk.Frame(self.top)
+        button_frame.pack(fill=tk.X, padx=5, pady=5)
+        retry_button = tk.Button(button_frame, text="Try Again", command=lambda: self.choose("retry"))
+        retry_button.pack(side=tk.LEFT, padx=5)
+        copy_button = tk.Button(button_frame, text="Save Elsewhere...", command=lambda: self.choose("save copy"))
+        copy_button.pack(side=tk.LEFT, padx=5)
+        quit_button = tk.Button(button_frame, text="Quit Without Saving", command=lambda: self.choose("quit"))
+        quit_button.pack(side=tk.LEFT, padx=5)
+
+    def choose(self, choice):
+        self.choice = choice
         self.top.destroy()
 
+
+class PerformanceWindow:
+    # Help -> Performance: per-action timings split by phase, and the memory held by the job table
+    def __init__(self, parent):
+        top = self.top = tk.Toplevel(parent.root)
+        self.parent = parent
+        self.top.title("Performance")
+
+        record_button = tk.Checkbutton(self.top, text="Record timings", variable=parent.perf_enabled, command=self.toggle_recording)
+        record_button.pack(anchor=tk.W, padx=5, pady=2)
+        self.memory_label = tk.Label(self.top, anchor=tk.W)
+        self.memory_label.pack(fill=tk.X, padx=5)
+        self.latest_label = tk.Label(self.top, anchor=tk.W)
+        self.latest_label.pack(fill=tk.X, padx=5)
+
+        columns = ("Action", "Count", "Last (ms)", "Mean (ms)", "95th (ms)", "Max (ms)", "Mean by Phase (ms)")
+        self.stats_tree = ttk.Treeview(self.top, columns=columns, show="headings", height=10)
+        for column in columns:
+            self.stats_tree.heading(column, text=column)
+            self.stats_tree.column(column, width=360 if column == "Mean by Phase (ms)" else 90, anchor=tk.W if column in ("Action", "Mean by Phase (ms)") else tk.E)
+        self.stats_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        button_frame = tk.Frame(self.top)
+        button_frame.pack(fill=tk.X, padx=5, pady=5)
+        tk.Button(button_frame, text="Measure Memory", command=self.measure_memory).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Export...", command=self.export_stats).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Clear", command=self.clear_stats).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Close", command=self.top.destroy).pack(side=tk.RIGHT, padx=5)
+
+        self.refresh()
+
+    def toggle_recording(self):
+        self.parent.toggle_performance()
+        self.show_stats()
+
+    def measure_memory(self):
+        self.parent.perf.sample_memory(self.parent.df)
+        self.show_stats()
+
+    def export_stats(self):
+        file_path = filedialog.asksaveasfilename(parent=self.top, title="Export Performance Stats", initialfile=PERF_STATS_FILE, defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if not file_path:
+            return
+        try:
+            self.parent.perf.export(file_path)
+        except OSError as error:
+            messagebox.showerror("Export Failed", f"Could not write {file_path}: {error}", parent=self.top)
+
+    def clear_stats(self):
+        self.parent.perf.clear()
+        self.show_stats()
+
+    def refresh(self):
+        # Redraw while the window is open
+        if not self.top.winfo_exists():
+            return
+        self.show_stats()
+        self.top.after(PERF_REFRESH_MS, self.refresh)
+
+    def show_stats(self):
+        perf = self.parent.perf
+        if perf.memory_bytes is None:
+            self.memory_label.config(text="Job table memory: not measured yet")
+        else:
+            self.memory_label.config(text=f"Job table memory: {perf.memory_bytes / 1e6:.1f} MB for {perf.memory_rows} rows")
+        latest = perf.latest()
+        if latest is None:
+            self.latest_label.config(text="Last action: none recorded" if perf.enabled else "Turn on Record timings to time actions")
+        else:
+            self.latest_label.config(text=f"Last action: {latest['action']}, {latest['seconds'] * 1000:.1f} ms")
+
+        self.stats_tree.delete(*self.stats_tree.get_children())
+        for name, stats in perf.summary().items():
+            phases = ", ".join(f"{phase} {seconds * 1000:.1f}" for phase, seconds in stats["phases"].items())
+            times = [f"{stats[key] * 1000:.1f}" for key in ("last", "mean", "p95", "max")]
+            self.stats_tree.insert("", tk.END, values=(name, stats["count"], *times, phases))
+
+
+class DashboardWindow:
+    # View -> Dashboard: open jobs by age, the oldest open jobs, open value by Location and jobs done per week.
+    # The totals are kept by the app's ShopDashboard as jobs change; this only redraws when they have moved.
+    def __init__(self, parent):
+        top = self.top = tk.Toplevel(parent.root)
+        self.parent = parent
+        self.top.title("Shop Dashboard")
+        self.shown = None  # (dashboard, version) last drawn
+
+        self.totals_label = tk.Label(self.top, anchor=tk.W)
+        self.totals_label.grid(row=0, column=0, columnspan=2, sticky=tk.EW, padx=5, pady=2)
+        self.bucket_tree = self.add_table("Open Jobs by Days in Shop", ("Days in Shop", "Jobs"), 1, 0)
+        self.oldest_tree = self.add_table("Oldest Open Jobs", ("Job Number", "Name", "Days in Shop"), 1, 1)
+        self.location_tree = self.add_table("Open Value by Location", ("Location", "Jobs", "Value"), 2, 0)
+        self.week_tree = self.add_table("Done Jobs by Week Completed", ("Week of", "Jobs"), 2, 1)
+        tk.Button(self.top, text="Close", command=self.top.destroy).grid(row=3, column=1, sticky=tk.E, padx=5, pady=5)
+        for column in (0, 1):
+            self.top.columnconfigure(column, weight=1)
+
+        self.refresh()
+
+    def add_table(self, title, columns, row, column):
+        frame = tk.LabelFrame(self.top, text=title)
+        frame.grid(row=row, column=column, sticky=tk.NSEW, padx=5, pady=5)
+        tree = ttk.Treeview(frame, columns=columns, show="headings", height=10)
+        for name in columns:
+            tree.heading(name, text=name)
+            tree.column(name, width=220 if name in ("Location", "Name") else 90, anchor=tk.E if name in ("Jobs", "Value") else tk.W)
+        tree.pack(fill=tk.BOTH, expand=True)
+        return tree
+
+    def refresh(self):
+        # Redraw while the window is open, and only once the totals have changed
+        if not self.top.winfo_exists():
+            return
+        dashboard = self.parent.dashboard
+        if dashboard.rows is None:
+            dashboard.build(self.parent.working_jobs())
+        if self.shown != (dashboard, dashboard.version):
+            self.shown = (dashboard, dashboard.version)
+            self.show_totals(dashboard)
+        self.top.after(DASHBOARD_REFRESH_MS, self.refresh)
+
+    def show_totals(self, dashboard):
+        self.totals_label.config(text=f"Open jobs: {sum(dashboard.open_counts)}, worth {job_model.format_price(dashboard.open_value)}")
+        oldest = dashboard.oldest_open()
+        jobs = self.parent.df.loc[[row_label for row_label, days in oldest], ["Job Number", "Name"]]
+        rows = {
+            self.bucket_tree: dashboard.open_by_bucket(),
+            self.oldest_tree: [(job_number, name, days) for (job_number, name), (row_label, days) in zip(jobs.itertuples(index=False), oldest)],
+            self.location_tree: [(location, open_jobs, job_model.format_price(value)) for location, open_jobs, value in dashboard.top_locations()],
+            self.week_tree: dashboard.completed_weeks(),
+        }
+        for tree, values in rows.items():
+            tree.delete(*tree.get_children())
+            for row_values in values:
+                tree.insert("", tk.END, values=row_values)
+
 # Running the application
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Job Management System")
+    parser.add_argument("file", nargs="?", default="jobs.xlsx", help="workbook (.xlsx) or SQLite database (.db) to open")
+    parser.add_argument("--archive-after", type=int, metavar="DAYS", help="once loaded, archive Done jobs produced more than DAYS days ago")
+    args = parser.parse_args()
+
     root = tk.Tk()
-    app = JobManagementApp(root)
+    app = JobManagementApp(root, args.file, archive_after=args.archive_after)
     root.mainloop()
 
 
@@ -0,0 +1,164 @@
+import queue
+import threading
+import time
+from functools import lru_cache
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+
+from job_model import AGING_COLORS, aging_buckets, format_rows
+
+HEADERS = ["Job Number", "Name", "Phone Number", "Location", "Sign Off Date", "Production Date", "Notes", "Days in Shop"]
+COLUMN_WIDTHS = [60, 110, 80, 90, 80, 80, 200, 60]
+WRAPPED_COLUMNS = {"Name", "Location", "Notes"}
+
+# Cells are plain, pre-wrapped strings rather than Paragraphs: measuring words once and knowing every row
+# height up front is far cheaper, and lets the rows be cut into tables that each fill exactly one page.
+FONT_NAME = "Helvetica"
+FONT_SIZE = 10
+LEADING = 12
+HORIZONTAL_PADDING = 6
+VERTICAL_PADDING = 3
+
+
+class ReportCancelled(Exception):
+    pass
+
+
+def undone_jobs(df):
+    return df[df["Status"] == "Not Done"].sort_values(by="Days in Shop")
+
+
+@lru_cache(maxsize=65536)
+def word_width(word):
+    return stringWidth(word, FONT_NAME, FONT_SIZE)
+
+
+@lru_cache(maxsize=65536)
+def wrap_cell(text, width):
+    # Greedy word wrap to the column's inner width; returns the text with line breaks inserted
+    space = word_width(" ")
+    lines = []
+    for paragraph in text.splitlines() or [""]:
+        line, line_width = [], 0
+        for word in paragraph.split():
+            extra = word_width(word) + (space if line else 0)
+            if line and line_width + extra > width:
+                lines.append(" ".join(line))
+                line, line_width = [], 0
+                extra = word_width(word)
+            line.append(word)
+            line_width += extra
+        lines.append(" ".join(line))
+    return "\n".join(lines)
+
+
+def table_style(header_rows, buckets):
+    style = TableStyle([
+        ('FONT', (0, 0), (-1, -1), FONT_NAME, FONT_SIZE, LEADING),  # Font and line spacing for all cells
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),  # Center alignment
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # Top align for wrapping content
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),  # Grid lines
+        ('BACKGROUND', (0, header_rows), (-1, -1), colors.beige),  # Row background color
+        ('TEXTCOLOR', (0, header_rows), (-1, -1), colors.black),  # Normal text color
+    ])
+    for column, header in enumerate(HEADERS):
+        if header in WRAPPED_COLUMNS:
+            style.add('ALIGN', (column, header_rows), (column, -1), 'LEFT')  # Wrapped text reads left to right
+    if header_rows:
+        style.add('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey)  # Header background color
+        style.add('TEXTCOLOR', (0, 0), (-1, 0), colors.black)  # Header text color
+
+    # Color "Days in Shop" by aging bucket; rows are sorted by days, so each bucket is one run
+    run_start = 0
+    for i in range(1, len(buckets) + 1):
+        if i == len(buckets) or buckets[i] != buckets[run_start]:
+            style.add('BACKGROUND', (7, run_start + header_rows), (7, i - 1 + header_rows), colors.HexColor(AGING_COLORS[buckets[run_start]]))
+            run_start = i
+    return style
+
+
+def build_undone_report(jobs, pdf_file, progress=None, cancel_event=None):
+    # Builds the undone-jobs report from an already filtered and sorted job table.
+    # progress(message) is called as pages are laid out and drawn; setting cancel_event aborts with
+    # ReportCancelled before anything is written.
+    def check_cancelled():
+        if cancel_event is not None and cancel_event.is_set():
+            raise ReportCancelled()
+
+    doc = SimpleDocTemplate(pdf_file, pagesize=landscape(letter))
+    page_height = doc.height - 12  # The frame's own top and bottom padding
+    text = format_rows(jobs)[HEADERS]
+    buckets = aging_buckets(jobs["Days in Shop"]).to_numpy()
+    total = len(text)
+
+    inner_widths = [width - 2 * HORIZONTAL_PADDING for width in COLUMN_WIDTHS]
+    wrapped = [header in WRAPPED_COLUMNS for header in HEADERS]
+
+    def row_cells(values):
+        cells = [wrap_cell(value, width) if wrap else value for value, width, wrap in zip(values, inner_widths, wrapped)]
+        height = max(cell.count("\n") + 1 for cell in cells) * LEADING + 2 * VERTICAL_PADDING
+        return cells, height
+
+    # One table per page: the first starts with the header, and each is cut before it would overflow
+    elements = []
+    header_cells, header_height = row_cells(HEADERS)
+    data, used, chunk_start = [header_cells], header_height, 0
+    for i, values in enumerate(text.itertuples(index=False)):
+        cells, height = row_cells(list(values))
+        if used + height > page_height and len(data) > (1 if not elements else 0):
+            elements.append(Table(data, colWidths=COLUMN_WIDTHS, style=table_style(0 if elements else 1, buckets[chunk_start:i])))
+            data, used, chunk_start = [], 0, i
+            check_cancelled()
+            if progress is not None:
+                progress(f"Preparing rows {i} of {total}")
+        data.append(cells)
+        used += height
+    elements.append(Table(data, colWidths=COLUMN_WIDTHS, style=table_style(0 if elements else 1, buckets[chunk_start:])))
+
+    page_count = len(elements)  # build() consumes the list
+
+    def on_page(canvas, doc):
+        check_cancelled()
+        if progress is not None:
+            progress(f"Writing page {doc.page} of {page_count}")
+
+    # Build the document (multi-page support); the file is only written once every page is done
+    doc.build(elements, onFirstPage=on_page, onLaterPages=on_page)
+
+
+class ReportJob:
+    # Runs build_undone_report on a background thread and posts (state, detail) messages for the UI:
+    # progress, done, cancelled, error
+    def __init__(self, jobs, pdf_file):
+        self.pdf_file = pdf_file
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.build_seconds = None
+        self.thread = threading.Thread(target=self.run, args=(jobs,), name="pdf-report", daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def drain(self):
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def run(self, jobs):
+        started = time.perf_counter()
+        try:
+            build_undone_report(jobs, self.pdf_file, progress=lambda message: self.messages.put(("progress", message)), cancel_event=self.cancel_event)
+        except ReportCancelled:
+            self.messages.put(("cancelled", None))
+        except Exception as error:
+            self.messages.put(("error", error))
+        else:
+            self.build_seconds = time.perf_counter() - started
+            self.messages.put(("done", self.pdf_file))
@@ -0,0 +1,149 @@
+import json
+import os
+import tempfile
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+# Most recent actions kept for the Performance window and stats exports
+HISTORY_SIZE = 1000
+
+NOT_TIMED = nullcontext()
+
+
+def timed_action(name):
+    # Method decorator: the call is timed as one action on the object's `perf` monitor
+    def decorate(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.perf.action(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def timed_phase(name):
+    # Method decorator: the call counts toward the named phase of whatever action is running
+    def decorate(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.perf.phase(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class PerformanceMonitor:
+    # Times user actions end to end and splits them into named phases (lookup, model update, save snapshot,
+    # list refresh, ...). Off by default; while off, action() and phase() hand back a shared no-op context.
+    # Only the UI thread calls into it: background work reports its own durations and the UI records them.
+    def __init__(self, history_size=HISTORY_SIZE):
+        self.enabled = False
+        self.history = deque(maxlen=history_size)
+        self.action_phases = None  # Phase totals of the action being timed, if any
+        self.open_phases = set()
+        self.memory_bytes = None
+        self.memory_rows = None
+
+    def action(self, name):
+        # Actions started from inside another action (e.g. a save that refreshes the list) count toward the outer one
+        if not self.enabled or self.action_phases is not None:
+            return NOT_TIMED
+        return self.action_timer(name)
+
+    def phase(self, name):
+        # A phase re-entered through nested calls is only timed once
+        if self.action_phases is None or name in self.open_phases:
+            return NOT_TIMED
+        return self.phase_timer(name)
+
+    @contextmanager
+    def action_timer(self, name):
+        self.action_phases = {}
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            phases, self.action_phases = self.action_phases, None
+            self.open_phases.clear()
+            self.record(name, seconds, phases)
+
+    @contextmanager
+    def phase_timer(self, name):
+        self.open_phases.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.open_phases.discard(name)
+            if self.action_phases is not None:
+                self.action_phases[name] = self.action_phases.get(name, 0) + time.perf_counter() - start
+
+    def record(self, name, seconds, phases=None):
+        if not self.enabled:
+            return
+        self.history.append({
+            "action": name,
+            "time": time.time(),
+            "seconds": seconds,
+            "phases": dict(phases or {}),
+            "memory_bytes": self.memory_bytes,
+            "rows": self.memory_rows,
+        })
+
+    def sample_memory(self, df):
+        # Deep memory_usage walks every string, so this is only done after loads and on request
+        if not self.enabled or df is None:
+            return
+        self.memory_bytes = int(df.memory_usage(deep=True).sum())
+        self.memory_rows = len(df)
+
+    def latest(self):
+        return self.history[-1] if self.history else None
+
+    def clear(self):
+        self.history.clear()
+
+    def summary(self):
+        # Per action: count, last/mean/95th percentile/max seconds, and the mean time spent in each phase
+        grouped = {}
+        for entry in self.history:
+            grouped.setdefault(entry["action"], []).append(entry)
+        stats = {}
+        for name, entries in grouped.items():
+            times = sorted(entry["seconds"] for entry in entries)
+            phase_totals = {}
+            for entry in entries:
+                for phase, seconds in entry["phases"].items():
+                    phase_totals[phase] = phase_totals.get(phase, 0) + seconds
+            stats[name] = {
+                "count": len(entries),
+                "last": entries[-1]["seconds"],
+                "mean": sum(times) / len(times),
+                "p95": times[min(len(times) - 1, int(len(times) * 0.95))],
+                "max": times[-1],
+                "phases": {phase: total / len(entries) for phase, total in phase_totals.items()},
+            }
+        return stats
+
+    def export(self, path):
+        # Written to a temp file and renamed, so a reader never sees half a file
+        report = {
+            "exported": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "memory_bytes": self.memory_bytes,
+            "rows": self.memory_rows,
+            "summary": self.summary(),
+            "history": list(self.history),
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(prefix=".perf-", suffix=".json", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as stats_file:
+                json.dump(report, stats_file, indent=2)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
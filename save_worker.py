@@ -0,0 +1,135 @@
+import queue
+import threading
+import time
+
+from storage import FileChangedError, SaveBatch
+
+# Wait before retrying a failed write, doubled after each failure up to the maximum
+RETRY_SECONDS = 1.0
+RETRY_MAX_SECONDS = 60.0
+
+
+class SaveWorker:
+    # Writes pending changes to a job store on a background thread. Changes that arrive within `delay`
+    # seconds of each other are merged into one batch, so a burst of edits costs a single write. A batch that
+    # fails to write goes back under any newer changes and is retried with backoff, so nothing is dropped.
+    def __init__(self, store, delay=0.5):
+        self.store = store
+        self.delay = delay
+        # (state, detail) tuples for the UI: pending, saving, written (a write finished but newer changes are
+        # waiting) and saved (nothing left to write), both with the write's seconds, and error
+        self.messages = queue.Queue()
+
+        self.condition = threading.Condition()
+        self.pending = None
+        self.due = 0
+        self.writing = False
+        self.stopped = False
+        self.failures = 0  # Failed writes in a row
+        self.error = None  # Why the last write failed; None once one succeeds
+        self.held = False  # A FileChangedError batch waits for the next request (the merged table) or a flush
+        self.attempts = 0
+        self.thread = threading.Thread(target=self.run, name="save-worker", daemon=True)
+        self.thread.start()
+
+    def request(self, df=None, rows=None, deleted=()):
+        # Snapshots are taken on the caller's thread; the worker never touches the live DataFrame.
+        # `df` replaces everything, `rows` maps row labels to column values, `deleted` lists row labels.
+        snapshot = None if df is None else df.copy()
+        with self.condition:
+            if self.pending is None:
+                self.pending = SaveBatch()
+            if snapshot is not None:
+                self.pending.replace_all(snapshot)
+            for row_label in deleted:
+                self.pending.delete(row_label)
+            for row_label, values in (rows or {}).items():
+                self.pending.upsert(row_label, values)
+            self.due = time.monotonic() + self.delay
+            self.held = False
+            self.condition.notify_all()
+        self.messages.put(("pending", None))
+
+    def has_pending(self):
+        with self.condition:
+            return self.pending is not None or self.writing
+
+    def is_held(self):
+        with self.condition:
+            return self.held
+
+    def flush(self, timeout=None):
+        # Write any pending changes now and wait for them to reach disk. False if they didn't: the time ran out,
+        # or the attempt failed (see `error`); the changes stay pending either way.
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            attempts = self.attempts
+            self.due = 0
+            self.held = False
+            self.condition.notify_all()
+            while self.pending is not None or self.writing:
+                if self.error is not None and self.attempts > attempts and not self.writing:
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def stop(self, flush=True):
+        # Returns False if changes were left unwritten; they stay in `pending`
+        if flush:
+            self.flush()
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        self.thread.join()
+        return self.pending is None
+
+    def drain(self):
+        # Status messages posted since the last call, oldest first
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.stopped and (self.pending is None or self.held or time.monotonic() < self.due):
+                    timeout = None if self.pending is None or self.held else self.due - time.monotonic()
+                    self.condition.wait(timeout)
+                if self.stopped:
+                    return  # stop() has already flushed; whatever is left failed to write
+                batch, self.pending = self.pending, None
+                self.writing = True
+
+            self.messages.put(("saving", None))
+            error = None
+            try:
+                started = time.perf_counter()
+                self.store.write(batch)
+                seconds = time.perf_counter() - started
+            except Exception as write_error:
+                error = write_error
+
+            with self.condition:
+                self.writing = False
+                self.attempts += 1
+                self.error = error
+                if error is None:
+                    self.failures = 0
+                    message = ("written" if self.pending is not None else "saved", seconds)
+                else:
+                    # Newer changes go on top of the failed batch, so the retry writes both
+                    if self.pending is not None:
+                        batch.extend(self.pending)
+                    self.pending = batch
+                    self.failures += 1
+                    self.held = isinstance(error, FileChangedError)
+                    self.due = time.monotonic() + min(RETRY_SECONDS * 2 ** (self.failures - 1), RETRY_MAX_SECONDS)
+                    message = ("error", error)
+                self.condition.notify_all()
+            self.messages.put(message)
@@ -0,0 +1,184 @@
+import bisect
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Columns the search box looks in
+SEARCH_COLUMNS = ["Name", "Location", "Notes", "Phone Number", "Job Number"]
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Per-word results kept between keystrokes; dropped whenever the index changes
+TERM_CACHE_SIZE = 256
+
+
+def field_tokens(column, value):
+    # Lowercase letter/digit runs; "555-0123" is also indexed as "5550123" so phones match with or without dashes
+    tokens = TOKEN_PATTERN.findall(str(value).lower())
+    if column == "Phone Number" and len(tokens) > 1:
+        tokens.append("".join(tokens))
+    return tokens
+
+
+def build_postings(text):
+    # From a frame of SEARCH_COLUMNS: (vocabulary, offsets, postings), where vocabulary is the sorted distinct
+    # tokens and postings[offsets[i]:offsets[i + 1]] are the row labels containing token i, ascending.
+    # Each column's distinct values are tokenized once and spread to their rows with numpy.
+    labels = text.index.to_numpy(dtype=np.int64)
+    token_parts, label_parts = [], []
+    for column in SEARCH_COLUMNS:
+        codes, uniques = pd.factorize(text[column])
+        value_tokens = [field_tokens(column, value) for value in np.asarray(uniques, dtype=object).tolist()] + [[]]
+        codes = np.where(codes < 0, len(uniques), codes)  # Blanks get the empty token list at the end
+        counts = np.array([len(tokens) for tokens in value_tokens], dtype=np.int64)
+        starts = np.cumsum(counts) - counts
+        flat = np.array([token for tokens in value_tokens for token in tokens] or [""], dtype=object)
+
+        # Position in `flat` of every (row, token) pair
+        row_counts = counts[codes]
+        row_starts = np.cumsum(row_counts) - row_counts
+        positions = np.repeat(starts[codes] - row_starts, row_counts) + np.arange(row_counts.sum())
+        token_parts.append(flat[positions])
+        label_parts.append(np.repeat(labels, row_counts))
+
+    token_ids, vocabulary = pd.factorize(np.concatenate(token_parts), sort=True)
+    row_labels = np.concatenate(label_parts)
+    order = np.lexsort((row_labels, token_ids))
+    token_ids, row_labels = token_ids[order], row_labels[order]
+    keep = np.ones(len(token_ids), dtype=bool)
+    keep[1:] = (token_ids[1:] != token_ids[:-1]) | (row_labels[1:] != row_labels[:-1])
+    token_ids, row_labels = token_ids[keep], row_labels[keep]
+    offsets = np.searchsorted(token_ids, np.arange(len(vocabulary) + 1))
+    return np.asarray(vocabulary, dtype=object), offsets, row_labels
+
+
+class JobSearchIndex:
+    # Inverted index from word tokens to DataFrame row labels, searched by word prefix.
+    # The bulk of it is built once per load into sorted numpy arrays, on a background thread. Rows added or
+    # edited afterwards are indexed in small per-token sets, and their entries in the arrays (like those of
+    # deleted rows) are masked out, so no change ever rescans the table.
+    def __init__(self):
+        self.generation = 0
+        self.built = None  # (generation, arrays or None, error) left by the build thread
+        self.reset()
+
+    def reset(self):
+        self.ready = False
+        self.vocabulary = np.array([], dtype=object)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.postings = np.array([], dtype=np.int64)
+        self.stale = set()  # Rows whose entries in the arrays are out of date
+        self.stale_labels = None
+        self.added = {}  # Token -> rows indexed since the build
+        self.added_tokens = []  # Sorted keys of `added`, for prefix lookups
+        self.row_tokens = {}  # Row -> its tokens in `added`
+        self.term_cache = {}
+
+    def build(self, df, background=True):
+        # Start over from df. Edits made while a background build runs are recorded as usual and still apply
+        # once the arrays are installed.
+        self.generation += 1
+        self.built = None
+        self.reset()
+        snapshot = df[SEARCH_COLUMNS].copy()
+        if not background:
+            self.run_build(snapshot, self.generation)
+            self.install_build()
+            return
+        threading.Thread(target=self.run_build, args=(snapshot, self.generation), name="search-index", daemon=True).start()
+
+    def run_build(self, snapshot, generation):
+        try:
+            self.built = (generation, build_postings(snapshot), None)
+        except Exception as error:
+            self.built = (generation, None, error)
+
+    def install_build(self):
+        # Called on the UI thread. Returns None while the build is running, else the build's error (or None on
+        # success) exactly once; `ready` tells whether search can be used.
+        built = self.built
+        if built is None or built[0] != self.generation:
+            return None
+        self.built = None
+        generation, arrays, error = built
+        if arrays is not None:
+            self.vocabulary, self.offsets, self.postings = arrays
+        self.ready = True
+        self.term_cache = {}
+        return error
+
+    def update_rows(self, rows):
+        # (Re)index rows that were added or edited; `rows` holds their current values
+        for row_label, values in zip(rows.index, rows[SEARCH_COLUMNS].itertuples(index=False)):
+            self.discard_added(row_label)
+            self.mark_stale(row_label)
+            tokens = set()
+            for column, value in zip(SEARCH_COLUMNS, values):
+                tokens.update(field_tokens(column, value))
+            self.row_tokens[row_label] = tokens
+            for token in tokens:
+                if token not in self.added:
+                    self.added[token] = set()
+                    bisect.insort(self.added_tokens, token)
+                self.added[token].add(row_label)
+        self.term_cache = {}
+
+    def remove_rows(self, row_labels):
+        for row_label in row_labels:
+            self.discard_added(row_label)
+            self.mark_stale(row_label)
+        self.term_cache = {}
+
+    def mark_stale(self, row_label):
+        self.stale.add(row_label)
+        self.stale_labels = None
+
+    def discard_added(self, row_label):
+        for token in self.row_tokens.pop(row_label, ()):
+            rows = self.added[token]
+            rows.discard(row_label)
+            if not rows:
+                del self.added[token]
+                del self.added_tokens[bisect.bisect_left(self.added_tokens, token)]
+
+    def search(self, query):
+        # Sorted array of row labels having, for every word of the query, a token starting with it;
+        # None for a blank query
+        terms = sorted(set(TOKEN_PATTERN.findall(query.lower())), key=len, reverse=True)
+        if not terms:
+            return None
+        matches = None
+        for term in terms:  # Longer words usually match fewer rows, so they go first
+            rows = self.term_rows(term)
+            matches = rows if matches is None else np.intersect1d(matches, rows, assume_unique=True)
+            if not len(matches):
+                break
+        return matches
+
+    def term_rows(self, term):
+        rows = self.term_cache.get(term)
+        if rows is not None:
+            return rows
+
+        # Every token with the prefix sits in one run of the sorted vocabulary
+        low, high = np.searchsorted(self.vocabulary, [term, term + "\uffff"])
+        rows = self.postings[self.offsets[low]:self.offsets[high]]
+        if high - low > 1:
+            rows = np.unique(rows)
+        if self.stale:
+            if self.stale_labels is None:
+                self.stale_labels = np.fromiter(self.stale, dtype=np.int64, count=len(self.stale))
+            rows = rows[~np.isin(rows, self.stale_labels)]
+
+        low = bisect.bisect_left(self.added_tokens, term)
+        high = bisect.bisect_left(self.added_tokens, term + "\uffff")
+        if low < high:
+            added = set().union(*(self.added[token] for token in self.added_tokens[low:high]))
+            rows = np.union1d(rows, np.fromiter(added, dtype=np.int64, count=len(added)))
+
+        if len(self.term_cache) >= TERM_CACHE_SIZE:
+            self.term_cache = {}
+        self.term_cache[term] = rows
+        return rows
@@ -0,0 +1,57 @@
+import numpy as np
+
+from job_model import sort_keys
+
+# Above this share of changed rows, a cached order is dropped and re-sorted instead of patched
+RESORT_FRACTION = 0.125
+
+
+class SortOrders:
+    # Sorted row orders of the job table, one per sort column (None being the default order). Each is computed
+    # the first time it's asked for, then patched as rows are added, changed or deleted, so a refresh or a
+    # switch back to an earlier sort doesn't sort the table again. Ties are ordered by row label.
+    def __init__(self):
+        self.orders = {}  # Column -> (keys, labels), both in sorted order
+
+    def clear(self):
+        self.orders = {}
+
+    def order(self, df, column=None, descending=False):
+        # Row labels in sort order, as a numpy array
+        entry = self.orders.get(column)
+        if entry is None:
+            keys = sort_keys(df, column)
+            labels = df.index.to_numpy()
+            positions = np.lexsort((labels, keys))
+            entry = self.orders[column] = (keys[positions], labels[positions])
+        return entry[1][::-1] if descending else entry[1]
+
+    def discard(self, *columns):
+        # Forget the orders of columns whose keys changed across the table
+        for column in columns:
+            self.orders.pop(column, None)
+
+    def remove_rows(self, row_labels):
+        row_labels = np.asarray(row_labels)
+        for column, (keys, labels) in list(self.orders.items()):
+            kept = ~np.isin(labels, row_labels)
+            self.orders[column] = (keys[kept], labels[kept])
+
+    def update_rows(self, df, row_labels):
+        # Re-place added or changed rows in every cached order
+        row_labels = np.asarray(row_labels)
+        self.remove_rows(row_labels)
+        changed = df.loc[row_labels]
+        for column, (keys, labels) in list(self.orders.items()):
+            if len(row_labels) > len(labels) * RESORT_FRACTION:
+                del self.orders[column]
+                continue
+            new_keys = sort_keys(changed, column)
+            positions = np.lexsort((row_labels, new_keys))
+            new_keys, new_labels = new_keys[positions], row_labels[positions]
+
+            # Insertion points: the run of equal keys, then the row label within it
+            low = np.searchsorted(keys, new_keys, side="left")
+            high = np.searchsorted(keys, new_keys, side="right")
+            points = [start + np.searchsorted(labels[start:end], label) for start, end, label in zip(low, high, new_labels)]
+            self.orders[column] = (np.insert(keys, points, new_keys), np.insert(labels, points, new_labels))
@@ -0,0 +1,248 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+
+import pandas as pd
+
+from job_model import to_storage
+
+# Columns a store keeps; Days in Shop is derived from Production Date on load. Completed Date is blank in files
+# written before it was kept.
+STORED_COLUMNS = ["Sign Off Date", "Name", "Phone Number", "Location", "Production Date", "Price", "Notes", "Job Number", "Status", "Completed Date"]
+
+
+def write_excel_atomic(df, file_path):
+    # Write to a temp file next to the workbook, then swap it in so a crash never leaves a half-written file
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(prefix=".~", suffix=".xlsx", dir=directory)
+    os.close(fd)
+    try:
+        df.to_excel(temp_path, index=False)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def cache_path_for(path):
+    # The pickled copy of a workbook lives in the user's own local cache directory, never next to the workbook:
+    # pickle runs code when loaded, and a shared folder is writable by everyone who shares it
+    directory = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    key = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()[:32]
+    return os.path.join(directory, "job_manager", f"{os.path.basename(path)}-{key}.pkl")
+
+
+def open_store(path):
+    # Pick a backend from the file extension; an http:// address is a job server shared with other stations
+    if path.startswith(("http://", "https://")):
+        from job_server import ServerJobStore
+        return ServerJobStore(path)
+    if os.path.splitext(path)[1].lower() in (".db", ".sqlite", ".sqlite3"):
+        return SqliteJobStore(path)
+    return ExcelJobStore(path)
+
+
+class FileChangedError(OSError):
+    # The store's file was changed by someone else since the store last read or wrote it
+    pass
+
+
+class SaveBatch:
+    # Changes waiting to be written: an optional full snapshot of the typed job table, then row upserts
+    # (already in stored form, see job_model.to_storage) and deletes keyed by row label
+    def __init__(self):
+        self.snapshot = None
+        self.rows = {}
+        self.deleted = set()
+
+    def replace_all(self, df):
+        self.snapshot = df
+        self.rows = {}
+        self.deleted = set()
+
+    def upsert(self, row_label, values):
+        self.deleted.discard(row_label)
+        self.rows[row_label] = values
+
+    def delete(self, row_label):
+        self.rows.pop(row_label, None)
+        self.deleted.add(row_label)
+
+    def extend(self, later):
+        # Applies a later batch on top of this one; its snapshot, deletes and rows win
+        if later.snapshot is not None:
+            self.replace_all(later.snapshot)
+        for row_label in later.deleted:
+            self.delete(row_label)
+        for row_label, values in later.rows.items():
+            self.upsert(row_label, values)
+
+
+class JobStore:
+    # Storage interface used by the app. Row labels of the loaded DataFrame identify rows in write().
+    path = None
+    row_updates = False  # True if write() can apply row upserts/deletes without a full snapshot
+    shared = False  # True if other stations change the same jobs; their changes come from drain_changes()
+
+    def load(self):
+        raise NotImplementedError
+
+    def write(self, batch):
+        raise NotImplementedError
+
+    def file_stamp(self):
+        # Something that changes whenever the store's file does, or None if the file can't be watched
+        return None
+
+    def next_row_label(self, df, count=1):
+        # Label for a new row (the first of `count`); row labels stay stable across deletes, so new rows go after
+        # the largest one
+        return df.index.max() + 1 if len(df.index) else 0
+
+    def drain_changes(self):
+        # Changes made elsewhere since the last call, oldest first (see job_server.py for their form)
+        return []
+
+
+class ExcelJobStore(JobStore):
+    # Parsing xlsx is slow, so a pickled copy of the table is kept in the user's cache directory (see
+    # cache_path_for) and used while the workbook's modification time and size still match.
+    def __init__(self, path, use_cache=True):
+        self.path = path
+        self.cache_path = cache_path_for(path) if use_cache else None
+        self.stamp = None  # file_stamp() of the version last read or written
+        self.check_stamp = False  # If set, write() won't overwrite changes someone else made since then
+
+    def file_stamp(self):
+        stat = os.stat(self.path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def read_cache(self, stamp):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return None
+        try:
+            with open(self.cache_path, "rb") as cache_file:
+                cached = pickle.load(cache_file)
+        except Exception:
+            return None  # Unreadable cache is just a cache miss
+        if cached.get("stamp") != stamp:
+            return None
+        return cached["df"]
+
+    def write_cache(self, df, stamp):
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".~", suffix=".pkl", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as cache_file:
+                pickle.dump({"stamp": stamp, "df": df}, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.cache_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def load(self):
+        stamp = self.stamp = self.file_stamp()
+        df = self.read_cache(stamp)
+        if df is not None:
+            return df
+
+        df = pd.read_excel(self.path)
+        if self.cache_path and self.file_stamp() == stamp:
+            # Rebuild the stale cache off the caller's thread so startup doesn't wait for it
+            threading.Thread(target=self.write_cache, args=(df.copy(), stamp), name="cache-writer", daemon=True).start()
+        return df
+
+    def write(self, batch):
+        # A workbook can only be rewritten whole
+        if batch.snapshot is None:
+            raise ValueError("Excel store needs a full snapshot to save")
+        if self.check_stamp and self.stamp is not None and os.path.exists(self.path) and self.file_stamp() != self.stamp:
+            raise FileChangedError(f"{self.path} was changed by someone else")
+        stored = to_storage(batch.snapshot)
+        write_excel_atomic(stored, self.path)
+        self.stamp = self.file_stamp()
+        if self.cache_path:
+            self.write_cache(stored, self.stamp)
+
+
+class SqliteJobStore(JobStore):
+    row_updates = True
+
+    sql_columns = {
+        "Sign Off Date": "sign_off_date",
+        "Name": "name",
+        "Phone Number": "phone_number",
+        "Location": "location",
+        "Production Date": "production_date",
+        "Price": "price",
+        "Notes": "notes",
+        "Job Number": "job_number",
+        "Status": "status",
+        "Completed Date": "completed_date",
+    }
+
+    def __init__(self, path):
+        self.path = path
+        connection = self.connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            column_sql = ", ".join(f"{name} TEXT" for name in self.sql_columns.values())
+            with connection:
+                connection.execute(f"CREATE TABLE IF NOT EXISTS jobs (id INTEGER PRIMARY KEY, {column_sql})")
+                # Databases made before a column was added get it, empty
+                existing = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+                for name in self.sql_columns.values():
+                    if name not in existing:
+                        connection.execute(f"ALTER TABLE jobs ADD COLUMN {name} TEXT")
+                connection.execute("CREATE INDEX IF NOT EXISTS jobs_job_number ON jobs (job_number)")
+                connection.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)")
+        finally:
+            connection.close()
+
+    def connect(self):
+        # A fresh connection per call keeps the store usable from both the UI thread and the save worker
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def load(self):
+        connection = self.connect()
+        try:
+            names = ", ".join(self.sql_columns.values())
+            df = pd.read_sql_query(f"SELECT id, {names} FROM jobs ORDER BY id", connection, index_col="id")
+        finally:
+            connection.close()
+        df.index.name = None
+        return df.rename(columns={name: column for column, name in self.sql_columns.items()})
+
+    def row_params(self, values):
+        return [None if pd.isna(values.get(column)) else str(values.get(column)) for column in STORED_COLUMNS]
+
+    def write(self, batch):
+        names = list(self.sql_columns.values())
+        insert_sql = f"INSERT INTO jobs (id, {', '.join(names)}) VALUES (?, {', '.join('?' for _ in names)})"
+        update_sql = f"UPDATE jobs SET {', '.join(f'{name} = ?' for name in names)} WHERE id = ?"
+
+        connection = self.connect()
+        try:
+            with connection:
+                if batch.snapshot is not None:
+                    connection.execute("DELETE FROM jobs")
+                    stored = to_storage(batch.snapshot)
+                    records = stored.to_dict("records")
+                    connection.executemany(insert_sql, ([int(label)] + self.row_params(values) for label, values in zip(stored.index, records)))
+                if batch.deleted:
+                    connection.executemany("DELETE FROM jobs WHERE id = ?", ((int(label),) for label in batch.deleted))
+                for label, values in batch.rows.items():
+                    params = self.row_params(values)
+                    # Edits are a single-row UPDATE; only new rows fall through to INSERT
+                    if connection.execute(update_sql, params + [int(label)]).rowcount == 0:
+                        connection.execute(insert_sql, [int(label)] + params)
+        finally:
+            connection.close()
@@ -0,0 +1,129 @@
+import os
+import random
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+import main
+from benchmark import generate_jobs, headless_app, write_jobs
+from job_model import job_number_index
+from performance import PerformanceMonitor
+
+LOOKUPS = 20000
+
+
+def jobs(rows):
+    return pd.DataFrame({"Job Number": [f"J{i:06d}" for i in range(rows)], "Name": [f"Customer {i}" for i in range(rows)]})
+
+
+def indexed_app(df):
+    # Just the parts of the app the Job Number index uses, without a window
+    app = main.JobManagementApp.__new__(main.JobManagementApp)
+    app.perf = PerformanceMonitor()
+    app.df = df
+    app.rebuild_job_index()
+    return app
+
+
+def lookup_seconds(app, job_numbers):
+    # Best of a few runs, so one slow run on a busy machine doesn't decide the result
+    best = None
+    for _ in range(5):
+        start = time.perf_counter()
+        for job_number in job_numbers:
+            app.find_job_row(job_number)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class JobIndexTest(unittest.TestCase):
+    def test_lookup_time_stays_flat(self):
+        # A scan of the column would be about 100 times slower at 100k rows than at 1k
+        random.seed(1)
+        timings = {}
+        for rows in (1000, 100000):
+            app = indexed_app(jobs(rows))
+            job_numbers = [f"J{random.randrange(rows):06d}" for _ in range(LOOKUPS)]
+            timings[rows] = lookup_seconds(app, job_numbers)
+        self.assertLess(timings[100000], timings[1000] * 5, timings)
+
+    def test_lookups_match_the_table(self):
+        df = jobs(1000)
+        app = indexed_app(df)
+        for row_label, job_number in df["Job Number"].items():
+            self.assertEqual(app.find_job_row(job_number), row_label)
+        self.assertEqual(app.find_job_row(" J000010 "), 10)  # Stripped like the column
+        self.assertIsNone(app.find_job_row("J999999"))
+
+    def test_index_follows_add_edit_and_delete(self):
+        # Through the app's own Add Job, Save and Delete, with stand-in widgets
+        directory = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        self.addCleanup(directory.cleanup)
+        cache = mock.patch.dict(os.environ, {"LOCALAPPDATA": directory.name, "XDG_CACHE_HOME": directory.name})
+        cache.start()
+        self.addCleanup(cache.stop)
+        file_path = os.path.join(directory.name, "jobs.xlsx")
+        write_jobs(generate_jobs(200, seed=1), file_path)
+        app = headless_app(file_path)
+        self.addCleanup(app.save_worker.stop)
+        app.labels = ["Sign Off Date", "Name", "Phone Number", "Location", "Production Date", "Price", "Notes", "Job Number"]
+        app.entries = {label: StandInEntry() for label in app.labels}
+
+        # Add
+        dialog = main.AddJobDialog.__new__(main.AddJobDialog)
+        dialog.parent = app
+        dialog.top = mock.Mock()
+        dialog.labels = []
+        values = {"Sign": "2024-01-01", "Name": "New Customer", "Phone": "555-0000", "Location": "Shop", "Production": "2024-01-02", "Price": "10", "Notes": "", "Job": "N0001"}
+        dialog.entries = {key: StandInEntry(value) for key, value in values.items()}
+        dialog.add_job()
+        added = app.find_job_row("N0001")
+        self.assertIsNotNone(added)
+
+        # Edit a Job Number
+        edited = app.df.index[5]
+        old_number = app.df.at[edited, "Job Number"]
+        app.job_tree.selection_set((app.row_items[edited],))
+        for label in app.labels:
+            app.entries[label].value = main.job_model.format_rows(app.df.loc[[edited]]).at[edited, label]
+        app.entries["Job Number"].value = "E0005"
+        app.save_job()
+
+        # Delete
+        deleted = app.df.index[7]
+        deleted_number = app.df.at[deleted, "Job Number"]
+        app.job_tree.selection_set((app.row_items[deleted],))
+        with mock.patch("main.messagebox.askyesno", return_value=True):
+            app.delete_job()
+
+        self.assertEqual(app.job_index, job_number_index(app.df))
+        self.assertEqual(app.find_job_row("N0001"), added)
+        self.assertEqual(app.find_job_row("E0005"), edited)
+        self.assertIsNone(app.find_job_row(old_number))
+        self.assertIsNone(app.find_job_row(deleted_number))
+
+
+class StandInEntry:
+    # Just what the job forms read from and write to an Entry or Text widget
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self, *index):
+        return self.value
+
+    def config(self, **options):
+        pass
+
+    def delete(self, *index):
+        self.value = ""
+
+    def insert(self, index, value):
+        self.value += value
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+import pandas as pd
+
+from job_model import diff_jobs, to_model
+
+
+def stored_jobs(rows, index=None):
+    # A typed table from (Job Number, Name, Price, Status) rows
+    return to_model(pd.DataFrame({
+        "Sign Off Date": "2024-01-01",
+        "Name": [row[1] for row in rows],
+        "Phone Number": "555-0123",
+        "Location": "Shop",
+        "Production Date": "2024-01-02",
+        "Price": [row[2] for row in rows],
+        "Notes": "",
+        "Job Number": [row[0] for row in rows],
+        "Status": [row[3] for row in rows],
+    }, index=index))
+
+
+class DiffJobsTest(unittest.TestCase):
+    def test_changed_added_and_removed(self):
+        local = stored_jobs([("J2", "Bob", "$20.00", "Not Done"), ("J1", "Ada", "$10.00", "Not Done"), ("J3", "Cy", "$30.00", "Done")], index=[10, 11, 12])
+        other = stored_jobs([("J3", "Cy", "$30.00", "Done"), ("J1", "Ada", "$15.00", "Not Done"), ("J4", "Dee", "$40.00", "Not Done")])
+        changed, added, removed = diff_jobs(local, other)
+        self.assertEqual(list(changed), [11])  # Keyed on the local row label, whatever order the rows are in
+        self.assertEqual(changed[11]["Price"], "$15.00")
+        self.assertEqual(changed[11]["Name"], "Ada")
+        self.assertEqual([row["Job Number"] for row in added], ["J4"])
+        self.assertEqual(added[0]["Production Date"], "2024-01-02")
+        self.assertEqual(removed, [10])
+
+    def test_same_jobs_have_no_differences(self):
+        # Days in Shop is left out; it only moves with the clock
+        local = stored_jobs([("J1", "Ada", "$10.00", "Not Done"), ("J2", "Bob", "", "Done")])
+        other = stored_jobs([("J1", "Ada", "$10.00", "Not Done"), ("J2", "Bob", "", "Done")])
+        other["Days in Shop"] += 3
+        self.assertEqual(diff_jobs(local, other), ({}, [], []))
+
+    def test_job_numbers_match_stripped(self):
+        # A padded Job Number is the same job with edited text, not a removal and an addition
+        local = stored_jobs([("J1", "Ada", "$10.00", "Not Done")])
+        other = stored_jobs([(" J1 ", "Ada", "$10.00", "Not Done")])
+        changed, added, removed = diff_jobs(local, other)
+        self.assertEqual(changed[0]["Job Number"], " J1 ")
+        self.assertEqual((added, removed), ([], []))
+
+    def test_duplicate_job_numbers_give_none(self):
+        local = stored_jobs([("J1", "Ada", "$10.00", "Not Done"), ("J2", "Bob", "$20.00", "Not Done")])
+        other = stored_jobs([("J1", "Ada", "$10.00", "Not Done"), ("J1", "Bob", "$20.00", "Not Done")])
+        self.assertIsNone(diff_jobs(local, other))
+        self.assertIsNone(diff_jobs(other, local))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import random
+import unittest
+
+import pandas as pd
+
+from benchmark import generate_jobs
+from job_model import append_jobs, new_job_frame, set_job_values, to_model
+from search_index import JobSearchIndex
+
+WORDS = ["maple", "map", "smith", "smithers", "oak", "555-0123", "rush", "ruth"]
+QUERIES = ["m", "ma", "map", "maple", "smith", "s", "oak", "5550123", "555 01", "ru", "rush smith", "j00", "zzz", ""]
+
+
+def built_index(df):
+    index = JobSearchIndex()
+    index.build(df, background=False)
+    return index
+
+
+class JobSearchIndexTest(unittest.TestCase):
+    def test_incremental_index_matches_a_rebuilt_one(self):
+        # Random adds, edits and deletes applied as the app does, checked against an index built from scratch
+        rng = random.Random(1)
+        df = to_model(generate_jobs(300, seed=1))
+        index = built_index(df)
+        next_label = df.index.max() + 1
+        for step in range(200):
+            action = rng.choice(["add", "edit", "edit", "delete"])
+            if action == "add":
+                fields = {"Sign Off Date": pd.Timestamp("2024-01-01"), "Name": rng.choice(WORDS), "Phone Number": "555-0123", "Location": rng.choice(WORDS), "Production Date": pd.Timestamp("2024-01-02"), "Price": 1000, "Notes": "", "Job Number": f"N{step:04d}"}
+                df = append_jobs(df, new_job_frame(fields, next_label))
+                index.update_rows(df.loc[[next_label]])
+                next_label += 1
+            elif action == "edit":
+                row_label = rng.choice(df.index.tolist())
+                set_job_values(df, row_label, {rng.choice(["Name", "Location", "Notes", "Phone Number"]): " ".join(rng.sample(WORDS, 2))})
+                index.update_rows(df.loc[[row_label]])
+            else:
+                row_label = rng.choice(df.index.tolist())
+                df = df.drop(index=row_label)
+                index.remove_rows([row_label])
+
+            if step % 20 == 19:
+                fresh = built_index(df)
+                for query in QUERIES:
+                    expected = fresh.search(query)
+                    if expected is None:
+                        self.assertIsNone(index.search(query), query)
+                    else:
+                        self.assertEqual(index.search(query).tolist(), expected.tolist(), (step, query))
+
+    def test_edit_after_a_search_is_not_served_from_the_cache(self):
+        df = to_model(generate_jobs(50, seed=2))
+        index = built_index(df)
+        self.assertNotIn(7, index.search("zebra").tolist())
+        set_job_values(df, 7, {"Name": "Zebra Crossing"})
+        index.update_rows(df.loc[[7]])
+        self.assertEqual(index.search("zebra").tolist(), [7])
+        index.remove_rows([7])
+        self.assertEqual(index.search("zebra").tolist(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import random
+import unittest
+
+import pandas as pd
+
+from benchmark import generate_jobs
+from job_model import append_jobs, new_job_frame, set_job_values, status_values, to_model
+from sort_orders import SortOrders
+
+SORT_COLUMNS = [None, "Name", "Price", "Production Date", "Completed Date", "Status", "Days in Shop"]
+NAMES = ["ada", "Ada", "bob", "", "zed", "Maple Smith"]
+
+
+class SortOrdersTest(unittest.TestCase):
+    def test_patched_orders_match_fresh_ones(self):
+        # Random adds, edits and deletes patched into every cached order, checked against sorting from scratch
+        rng = random.Random(1)
+        df = to_model(generate_jobs(400, seed=1))
+        orders = SortOrders()
+        for column in SORT_COLUMNS:
+            orders.order(df, column)
+        next_label = df.index.max() + 1
+        for step in range(200):
+            action = rng.choice(["add", "edit", "edit", "status", "delete"])
+            if action == "add":
+                fields = {"Sign Off Date": pd.Timestamp("2024-01-01"), "Name": rng.choice(NAMES), "Phone Number": "555-0123", "Location": "Shop", "Production Date": pd.Timestamp("2024-01-02"), "Price": rng.choice([0, 1000, 5000]), "Notes": "", "Job Number": f"N{step:04d}"}
+                df = append_jobs(df, new_job_frame(fields, next_label))
+                orders.update_rows(df, [next_label])
+                next_label += 1
+            elif action == "edit":
+                row_labels = rng.sample(df.index.tolist(), rng.randint(1, 3))
+                for row_label in row_labels:
+                    set_job_values(df, row_label, {"Name": rng.choice(NAMES), "Price": rng.choice([pd.NA, 1000, 2500])})
+                orders.update_rows(df, row_labels)
+            elif action == "status":
+                row_label = rng.choice(df.index.tolist())
+                set_job_values(df, row_label, status_values(rng.choice(["Done", "Not Done"]), pd.Timestamp("2024-06-01")))
+                orders.update_rows(df, [row_label])
+            else:
+                row_label = rng.choice(df.index.tolist())
+                df = df.drop(index=row_label)
+                orders.remove_rows([row_label])
+
+            if step % 20 == 19:
+                for column in SORT_COLUMNS:
+                    for descending in (False, True):
+                        expected = SortOrders().order(df, column, descending)
+                        self.assertEqual(orders.order(df, column, descending).tolist(), expected.tolist(), (step, column, descending))
+
+    def test_large_change_drops_the_cached_order(self):
+        df = to_model(generate_jobs(40, seed=2))
+        orders = SortOrders()
+        orders.order(df, "Name")
+        row_labels = df.index[:20].tolist()
+        for row_label in row_labels:
+            set_job_values(df, row_label, {"Name": "Ada"})
+        orders.update_rows(df, row_labels)
+        self.assertNotIn("Name", orders.orders)
+        self.assertEqual(orders.order(df, "Name").tolist(), SortOrders().order(df, "Name").tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()